@@ -1,20 +1,76 @@
 # app/api/routes/benchmark.py
-from typing import List, Dict, Any
+import asyncio
+from collections import defaultdict
+from typing import List, Dict, Any, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, text
+from sqlalchemy.orm import selectinload
 
 from app.db.session import get_db
 from app.models.query_log import QueryLog
 from app.models.suggestion import Suggestion
 from app.services.benchmark_engine import benchmark_engine, BenchmarkResult
 from app.services.rule_engine import rule_engine
+from app.workers.benchmark_worker import run_benchmark_by_id
+from app.core.cache import stats_cache
+from app.core.config import settings
+from app.core.task_queue import task_queue
 from app.core.logger import logger
 
 router = APIRouter()
 
+# Concurrent benchmarks per batch; kept below the connection pool size so
+# the batch cannot starve request handlers of connections
+BATCH_CONCURRENCY = 4
+
+# Text statements hoisted to module scope so their compiled form and
+# result metadata are built once, not per request; columns are listed
+# explicitly so unused ones are never transferred
+_BENCHMARK_RESULTS_STMT = text("""
+    SELECT id, original_avg_ms, optimized_avg_ms, improvement_pct,
+           improvement_ms, confidence, optimization_type, success, created_at
+    FROM performance_improvements
+    WHERE query_id = :query_id
+    ORDER BY created_at DESC
+    LIMIT 10
+""")
+
+_TOP_IMPROVEMENTS_STMT = text("""
+    SELECT
+        pi.query_id,
+        pi.original_query,
+        pi.optimized_query,
+        pi.improvement_pct,
+        pi.improvement_ms,
+        pi.confidence,
+        pi.optimization_type,
+        pi.created_at
+    FROM performance_improvements pi
+    WHERE pi.success = true
+    ORDER BY pi.improvement_pct DESC
+    LIMIT :limit
+""")
+
+# NOT EXISTS lets the planner run an index-only anti-join against
+# (query_id, created_at); a LEFT JOIN + OR-IS-NULL filter would defeat
+# index use and need a per-row cast
+_SLOW_QUERIES_STMT = text("""
+    SELECT ql.* FROM query_logs ql
+    WHERE ql.mean_exec_time > :min_time
+    AND NOT EXISTS (
+        SELECT 1 FROM performance_improvements pi
+        WHERE pi.query_id = ql.id
+        AND pi.created_at >= NOW() - INTERVAL '24 hours'
+    )
+    ORDER BY ql.mean_exec_time DESC
+    LIMIT :limit
+""")
+
 
 @router.post("/run/{query_id}")
 async def run_benchmark(
@@ -36,34 +92,35 @@ async def run_benchmark(
         Benchmark initiation confirmation
     """
     try:
-        # Get the query
-        result = await db.execute(select(QueryLog).where(QueryLog.id == query_id))
+        # Get the query with its suggestions eager-loaded in one round-trip
+        result = await db.execute(
+            select(QueryLog)
+            .options(selectinload(QueryLog.suggestions))
+            .where(QueryLog.id == query_id)
+        )
         query_log = result.scalar_one_or_none()
-        
+
         if not query_log:
             raise HTTPException(status_code=404, detail="Query not found")
-        
-        # Get suggestions for the query
-        suggestions = await rule_engine.get_suggestions_for_query(db, str(query_id))
-        
+
+        suggestions = list(query_log.suggestions)
+
         if not suggestions:
             # Generate suggestions if none exist
             suggestions = await rule_engine.generate_suggestions(db, query_log)
         
-        # Run benchmark in background
-        background_tasks.add_task(
-            run_benchmark_task, 
-            query_log, 
-            suggestions, 
-            iterations
-        )
-        
+        # Prefer the durable job queue; fall back to an in-process
+        # background task when no queue is configured
+        queued = await task_queue.enqueue("benchmark_query_job", str(query_id), iterations)
+        if not queued:
+            background_tasks.add_task(run_benchmark_by_id, str(query_id), iterations)
+
         return {
             "message": f"Benchmark started for query {query_id}",
             "query_id": str(query_id),
             "iterations": iterations,
             "suggestions_count": len(suggestions),
-            "status": "running"
+            "status": "queued" if queued else "running"
         }
         
     except HTTPException:
@@ -73,27 +130,6 @@ async def run_benchmark(
         raise HTTPException(status_code=500, detail="Failed to start benchmark")
 
 
-async def run_benchmark_task(
-    query_log: QueryLog,
-    suggestions: List[Suggestion], 
-    iterations: int
-):
-    """Background task to run the actual benchmark."""
-    try:
-        from app.db.session import AsyncSessionLocal
-        
-        async with AsyncSessionLocal() as session:
-            result = await benchmark_engine.run_comprehensive_benchmark(
-                session, query_log, suggestions, iterations
-            )
-            
-            logger.info(f"Background benchmark completed for query {query_log.id}: "
-                       f"{result.improvement_pct:.1f}% improvement")
-            
-    except Exception as e:
-        logger.error(f"Background benchmark failed for query {query_log.id}: {e}")
-
-
 @router.get("/results/{query_id}")
 async def get_benchmark_results(
     query_id: UUID,
@@ -110,34 +146,25 @@ async def get_benchmark_results(
         Benchmark results for the query
     """
     try:
-        from sqlalchemy import text
-        
-        results_query = text("""
-            SELECT * FROM performance_improvements 
-            WHERE query_id = :query_id 
-            ORDER BY created_at DESC 
-            LIMIT 10
-        """)
-        
-        result = await db.execute(results_query, {"query_id": str(query_id)})
+        result = await db.execute(_BENCHMARK_RESULTS_STMT, {"query_id": str(query_id)})
         results = result.fetchall()
-        
+
         if not results:
             raise HTTPException(status_code=404, detail="No benchmark results found for this query")
-        
+
         return {
             "query_id": str(query_id),
             "results": [
                 {
-                    "id": str(row[0]),
-                    "original_avg_ms": row[4],
-                    "optimized_avg_ms": row[5], 
-                    "improvement_pct": row[6],
-                    "improvement_ms": row[7],
-                    "confidence": row[8],
-                    "optimization_type": row[9],
-                    "success": row[10],
-                    "created_at": row[12].isoformat() if row[12] else None
+                    "id": str(row.id),
+                    "original_avg_ms": row.original_avg_ms,
+                    "optimized_avg_ms": row.optimized_avg_ms,
+                    "improvement_pct": row.improvement_pct,
+                    "improvement_ms": row.improvement_ms,
+                    "confidence": row.confidence,
+                    "optimization_type": row.optimization_type,
+                    "success": row.success,
+                    "created_at": row.created_at.isoformat() if row.created_at else None
                 }
                 for row in results
             ]
@@ -152,25 +179,41 @@ async def get_benchmark_results(
 
 @router.get("/summary")
 async def get_benchmark_summary(
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db)
 ):
     """
     Get overall benchmark summary statistics.
-    
+
     Args:
+        request: Incoming request (checked for If-None-Match)
+        response: Outgoing response (carries the ETag)
         db: Database session
-        
+
     Returns:
-        Summary statistics of all benchmarks
+        Summary statistics of all benchmarks, or 304 if unchanged
     """
     try:
-        summary = await benchmark_engine.get_benchmark_summary(db)
-        
+        summary = await stats_cache.get_or_set(
+            "benchmark:summary", 30,
+            lambda: benchmark_engine.get_benchmark_summary(db)
+        )
+
+        # The latest result timestamp is a natural validator: the summary
+        # only changes when a new benchmark result lands
+        last_benchmark_at = summary.get("last_benchmark_at")
+        if last_benchmark_at:
+            etag = f'W/"{last_benchmark_at}"'
+            if request.headers.get("if-none-match") == etag:
+                return Response(status_code=304)
+            response.headers["ETag"] = etag
+
         return {
             "summary": summary,
-            "generated_at": "2024-01-01T00:00:00Z"  # Use actual timestamp
+            "generated_at": datetime.utcnow().isoformat() + "Z"
         }
-        
+
     except Exception as e:
         logger.error(f"Error getting benchmark summary: {e}")
         raise HTTPException(status_code=500, detail="Failed to get benchmark summary")
@@ -192,38 +235,20 @@ async def get_top_improvements(
         List of top performing optimizations
     """
     try:
-        from sqlalchemy import text
-        
-        top_query = text("""
-            SELECT 
-                pi.query_id,
-                pi.original_query,
-                pi.optimized_query,
-                pi.improvement_pct,
-                pi.improvement_ms,
-                pi.confidence,
-                pi.optimization_type,
-                pi.created_at
-            FROM performance_improvements pi
-            WHERE pi.success = true 
-            ORDER BY pi.improvement_pct DESC 
-            LIMIT :limit
-        """)
-        
-        result = await db.execute(top_query, {"limit": limit})
+        result = await db.execute(_TOP_IMPROVEMENTS_STMT, {"limit": limit})
         improvements = result.fetchall()
         
         return {
             "top_improvements": [
                 {
-                    "query_id": str(row[0]),
-                    "original_query": row[1][:100] + "..." if len(row[1]) > 100 else row[1],
-                    "optimized_query": row[2][:100] + "..." if len(row[2]) > 100 else row[2],
-                    "improvement_pct": row[3],
-                    "improvement_ms": row[4],
-                    "confidence": row[5],
-                    "optimization_type": row[6],
-                    "created_at": row[7].isoformat() if row[7] else None
+                    "query_id": str(row.query_id),
+                    "original_query": row.original_query[:100] + "..." if len(row.original_query) > 100 else row.original_query,
+                    "optimized_query": row.optimized_query[:100] + "..." if len(row.optimized_query) > 100 else row.optimized_query,
+                    "improvement_pct": row.improvement_pct,
+                    "improvement_ms": row.improvement_ms,
+                    "confidence": row.confidence,
+                    "optimization_type": row.optimization_type,
+                    "created_at": row.created_at.isoformat() if row.created_at else None
                 }
                 for row in improvements
             ],
@@ -239,54 +264,52 @@ async def get_top_improvements(
 async def run_batch_benchmark(
     background_tasks: BackgroundTasks,
     limit: int = 50,
-    min_execution_time: float = 100.0,
+    min_execution_time: Optional[float] = None,
     db: AsyncSession = Depends(get_db)
 ):
     """
     Run benchmarks on multiple slow queries in batch.
-    
+
     Args:
         background_tasks: FastAPI background tasks
         limit: Maximum number of queries to benchmark
-        min_execution_time: Minimum execution time to consider for benchmarking
+        min_execution_time: Minimum execution time to consider for
+            benchmarking; defaults to the engine's slow-query threshold
+            so candidates are never selected just to be rejected by the
+            benchmark guard
         db: Database session
-        
+
     Returns:
         Batch benchmark initiation confirmation
     """
+    if min_execution_time is None:
+        min_execution_time = settings.slow_query_threshold_ms
     try:
-        # Get slow queries that haven't been benchmarked recently
-        from sqlalchemy import text
-        
-        slow_queries_query = text("""
-            SELECT ql.* FROM query_logs ql
-            LEFT JOIN performance_improvements pi ON ql.id::text = pi.query_id
-            WHERE ql.mean_exec_time > :min_time
-            AND (pi.created_at IS NULL OR pi.created_at < NOW() - INTERVAL '24 hours')
-            ORDER BY ql.mean_exec_time DESC
-            LIMIT :limit
-        """)
-        
-        result = await db.execute(slow_queries_query, {
-            "min_time": min_execution_time,
-            "limit": limit
-        })
-        
-        queries = result.fetchall()
-        
-        if not queries:
+        # Stream rows through a server-side cursor instead of buffering
+        # the whole result set before converting it
+        result = await db.stream(
+            _SLOW_QUERIES_STMT.execution_options(yield_per=50),
+            {"min_time": min_execution_time, "limit": limit}
+        )
+
+        queries_data = [dict(row._mapping) async for row in result]
+
+        if not queries_data:
             return {
                 "message": "No queries found for batch benchmarking",
                 "queries_count": 0
             }
-        
-        # Start batch benchmark in background
-        background_tasks.add_task(run_batch_benchmark_task, [dict(q._mapping) for q in queries])
-        
+
+        # Prefer the durable job queue; fall back to an in-process
+        # background task when no queue is configured
+        queued = await task_queue.enqueue("batch_benchmark_job", queries_data)
+        if not queued:
+            background_tasks.add_task(run_batch_benchmark_task, queries_data)
+
         return {
-            "message": f"Batch benchmark started for {len(queries)} queries",
-            "queries_count": len(queries),
-            "status": "running"
+            "message": f"Batch benchmark started for {len(queries_data)} queries",
+            "queries_count": len(queries_data),
+            "status": "queued" if queued else "running"
         }
         
     except Exception as e:
@@ -295,47 +318,80 @@ async def run_batch_benchmark(
 
 
 async def run_batch_benchmark_task(queries_data: List[Dict[str, Any]]):
-    """Background task to run batch benchmarks."""
+    """Background task to run batch benchmarks with bounded concurrency."""
     try:
         from app.db.session import AsyncSessionLocal
-        
+
         logger.info(f"Starting batch benchmark for {len(queries_data)} queries")
-        
-        successful = 0
-        failed = 0
-        
-        for query_data in queries_data:
+
+        # Fetch existing suggestions for the whole batch in one IN query
+        # instead of one SELECT per benchmarked query
+        suggestions_by_query: Dict[Any, List[Suggestion]] = defaultdict(list)
+        async with AsyncSessionLocal() as session:
+            batch_ids = [query_data["id"] for query_data in queries_data]
+            rows = await session.execute(
+                select(Suggestion).where(Suggestion.query_id.in_(batch_ids))
+            )
+            for suggestion in rows.scalars().all():
+                suggestions_by_query[suggestion.query_id].append(suggestion)
+
+        async def benchmark_one(session: AsyncSession, query_data: Dict[str, Any]) -> bool:
+            """Benchmark a single query; returns True on success."""
             try:
-                async with AsyncSessionLocal() as session:
-                    # Reconstruct QueryLog object
-                    query_log = QueryLog(**query_data)
-                    
-                    # Get or generate suggestions
-                    suggestions = await rule_engine.get_suggestions_for_query(
-                        session, str(query_log.id)
-                    )
-                    
-                    if not suggestions:
-                        suggestions = await rule_engine.generate_suggestions(session, query_log)
-                    
-                    # Run benchmark
-                    result = await benchmark_engine.run_comprehensive_benchmark(
-                        session, query_log, suggestions, iterations=3
-                    )
-                    
-                    if result.success:
-                        successful += 1
-                        logger.info(f"Batch benchmark success for query {query_log.id}: "
-                                   f"{result.improvement_pct:.1f}% improvement")
-                    else:
-                        failed += 1
-                        logger.warning(f"Batch benchmark failed for query {query_log.id}")
-                        
+                # Reconstruct QueryLog object
+                query_log = QueryLog(**query_data)
+
+                # Use pre-fetched suggestions, generating only when
+                # none exist for this query yet
+                suggestions = suggestions_by_query.get(query_log.id)
+
+                if not suggestions:
+                    suggestions = await rule_engine.generate_suggestions(session, query_log)
+
+                # Run benchmark
+                result = await benchmark_engine.run_comprehensive_benchmark(
+                    session, query_log, suggestions, iterations=3
+                )
+
+                if result.success:
+                    logger.info(f"Batch benchmark success for query {query_log.id}: "
+                               f"{result.improvement_pct:.1f}% improvement")
+                else:
+                    logger.warning(f"Batch benchmark failed for query {query_log.id}")
+
+                return result.success
+
             except Exception as e:
-                failed += 1
                 logger.error(f"Error in batch benchmark for query: {e}")
-        
+                await session.rollback()
+                return False
+
+        # Distribute work over a fixed pool of workers, each reusing one
+        # session (and thus one pooled connection) for its whole share of
+        # the batch instead of opening a session per query
+        work_queue: asyncio.Queue = asyncio.Queue()
+        for query_data in queries_data:
+            work_queue.put_nowait(query_data)
+
+        async def worker() -> List[bool]:
+            """Drain queries from the queue, reusing a single session."""
+            outcomes: List[bool] = []
+            async with AsyncSessionLocal() as session:
+                while True:
+                    try:
+                        query_data = work_queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return outcomes
+                    outcomes.append(await benchmark_one(session, query_data))
+
+        num_workers = min(BATCH_CONCURRENCY, len(queries_data))
+        worker_results = await asyncio.gather(*(worker() for _ in range(num_workers)))
+        results = [ok for outcomes in worker_results for ok in outcomes]
+
+        successful = sum(1 for ok in results if ok)
+        failed = len(results) - successful
+
         logger.info(f"Batch benchmark completed: {successful} successful, {failed} failed")
-        
+
     except Exception as e:
         logger.error(f"Batch benchmark task failed: {e}")
\ No newline at end of file
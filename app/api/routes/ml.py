@@ -1,3 +1,4 @@
+import asyncio
 from typing import Dict, Any
 from uuid import UUID
 
@@ -7,7 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.session import get_db
 from app.schemas.suggestion import PredictionRequest, PredictionResponse
 from app.services.ml_engine import ml_engine
-from app.services.feature_extractor import feature_extractor
+from app.services.feature_extractor import extract_query_features_cached
 from app.core.logger import logger
 
 router = APIRouter()
@@ -29,11 +30,16 @@ async def predict_execution_time(
         Prediction results with suggestions
     """
     try:
-        # Extract features from query text if not provided
+        # Extract features from query text if not provided; parsing is
+        # CPU-bound, so run it off the event loop
         if not request.features:
-            request.features = feature_extractor.extract_query_features(request.query_text)
+            request.features = await asyncio.to_thread(
+                extract_query_features_cached, request.query_text
+            )
         
-        # Make prediction
+        # Make prediction (waits for the background model load on the
+        # first requests after startup)
+        await ml_engine.wait_ready()
         prediction = await ml_engine.predict_execution_time(request.features)
         
         # Generate ML-based suggestions
@@ -138,8 +144,8 @@ async def extract_features(
         Extracted features
     """
     try:
-        features = feature_extractor.extract_query_features(query_text)
-        
+        features = await asyncio.to_thread(extract_query_features_cached, query_text)
+
         return {
             "query_text": query_text,
             "features": features
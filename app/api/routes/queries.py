@@ -1,9 +1,11 @@
-from typing import List, Optional
+import base64
+from datetime import datetime
+from typing import List, Optional, Tuple
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import func, select, tuple_
 
 from app.db.session import get_db
 from app.models.query_log import QueryLog
@@ -13,49 +15,92 @@ from app.core.logger import logger
 
 router = APIRouter()
 
+# Hoisted so the compiled form is cached once and reused per request
+_COUNT_QUERIES_STMT = select(func.count()).select_from(QueryLog)
+
+
+def _encode_cursor(collected_at: datetime, query_id: UUID) -> str:
+    """Encode a (collected_at, id) keyset position as an opaque cursor."""
+    return base64.urlsafe_b64encode(
+        f"{collected_at.isoformat()}|{query_id}".encode()
+    ).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Decode a cursor back into its (collected_at, id) keyset position."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        collected_at_raw, query_id_raw = raw.split("|", 1)
+        return datetime.fromisoformat(collected_at_raw), UUID(query_id_raw)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
 
 @router.get("/", response_model=QueryLogList)
 async def list_queries(
-    page: int = Query(1, ge=1, description="Page number"),
+    page: int = Query(1, ge=1, description="Page number (ignored when cursor is set)"),
     size: int = Query(20, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from a previous response"),
+    include_total: bool = Query(False, description="Also compute the exact total count"),
     db: AsyncSession = Depends(get_db)
 ):
     """
     List all query logs with pagination.
-    
+
+    Prefer cursor-based (keyset) paging: it reads only `size` rows via
+    the collected_at index no matter how deep the page, while OFFSET
+    paging scans and discards all preceding rows. The page parameter is
+    kept for backwards compatibility.
+
     Args:
-        page: Page number (1-based)
+        page: Page number (1-based, legacy OFFSET paging)
         size: Number of items per page
+        cursor: Opaque keyset cursor from a previous response
+        include_total: Whether to run the extra COUNT query
         db: Database session
-        
+
     Returns:
-        Paginated list of query logs
+        Paginated list of query logs with a next_cursor for keyset paging
     """
     try:
-        # Calculate offset
-        offset = (page - 1) * size
-        
-        # Get total count
-        count_result = await db.execute(select(QueryLog))
-        total = len(count_result.scalars().all())
-        
-        # Get paginated results
-        result = await db.execute(
+        stmt = (
             select(QueryLog)
-            .order_by(QueryLog.collected_at.desc())
-            .offset(offset)
+            .order_by(QueryLog.collected_at.desc(), QueryLog.id.desc())
             .limit(size)
         )
-        
+
+        if cursor is not None:
+            last_collected_at, last_id = _decode_cursor(cursor)
+            stmt = stmt.where(
+                tuple_(QueryLog.collected_at, QueryLog.id) < (last_collected_at, last_id)
+            )
+        elif page > 1:
+            stmt = stmt.offset((page - 1) * size)
+
+        result = await db.execute(stmt)
         queries = result.scalars().all()
-        
+
+        # Exact totals force a full count; only pay for it on request
+        total = None
+        if include_total:
+            count_result = await db.execute(_COUNT_QUERIES_STMT)
+            total = count_result.scalar_one()
+
+        next_cursor = None
+        if len(queries) == size:
+            last = queries[-1]
+            next_cursor = _encode_cursor(last.collected_at, last.id)
+
         return QueryLogList(
             queries=[QueryLogResponse.model_validate(query) for query in queries],
             total=total,
-            page=page,
-            size=size
+            page=None if cursor else page,
+            size=size,
+            next_cursor=next_cursor
         )
-        
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error listing queries: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
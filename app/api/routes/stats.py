@@ -3,16 +3,28 @@ from datetime import datetime, timedelta
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, desc
+from sqlalchemy import case, select, func, desc
 
 from app.db.session import get_db
 from app.models.query_log import QueryLog
 from app.models.suggestion import Suggestion
 from app.models.features import QueryFeature
+from app.core.response_cache import response_cache
 from app.core.logger import logger
 
 router = APIRouter()
 
+# Statements with a stable shape are hoisted to module scope so the
+# engine's compiled-statement cache is hit on every request
+_OVERVIEW_STMT = select(
+    func.count(QueryLog.id),
+    func.count(QueryLog.id).filter(QueryLog.mean_exec_time > 1000),
+    func.avg(QueryLog.mean_exec_time),
+    func.sum(QueryLog.total_exec_time),
+).select_from(QueryLog)
+
+_SUGGESTION_COUNT_STMT = select(func.count(Suggestion.id))
+
 
 @router.get("/overview")
 async def get_system_overview(
@@ -28,37 +40,31 @@ async def get_system_overview(
         System overview statistics
     """
     try:
-        # Get total queries
-        total_queries_result = await db.execute(select(func.count(QueryLog.id)))
-        total_queries = total_queries_result.scalar()
-        
-        # Get slow queries count
-        slow_queries_result = await db.execute(
-            select(func.count(QueryLog.id)).where(QueryLog.mean_exec_time > 1000)
-        )
-        slow_queries = slow_queries_result.scalar()
-        
-        # Get total suggestions
-        total_suggestions_result = await db.execute(select(func.count(Suggestion.id)))
-        total_suggestions = total_suggestions_result.scalar()
-        
-        # Get average execution time
-        avg_time_result = await db.execute(select(func.avg(QueryLog.mean_exec_time)))
-        avg_execution_time = avg_time_result.scalar() or 0.0
-        
-        # Get total execution time
-        total_time_result = await db.execute(select(func.sum(QueryLog.total_exec_time)))
-        total_execution_time = total_time_result.scalar() or 0.0
-        
-        return {
-            "total_queries": total_queries,
-            "slow_queries": slow_queries,
-            "total_suggestions": total_suggestions,
-            "avg_execution_time_ms": round(avg_execution_time, 2),
-            "total_execution_time_ms": round(total_execution_time, 2),
-            "slow_query_percentage": round((slow_queries / total_queries * 100) if total_queries > 0 else 0, 2)
-        }
-        
+        async def compute_overview():
+            # Compute all QueryLog aggregates in a single round-trip using
+            # conditional aggregation instead of five separate queries
+            overview_result = await db.execute(_OVERVIEW_STMT)
+            total_queries, slow_queries, avg_execution_time, total_execution_time = overview_result.one()
+            avg_execution_time = avg_execution_time or 0.0
+            total_execution_time = total_execution_time or 0.0
+
+            # Suggestions live in a separate table, so they need their own count
+            total_suggestions_result = await db.execute(_SUGGESTION_COUNT_STMT)
+            total_suggestions = total_suggestions_result.scalar()
+
+            return {
+                "total_queries": total_queries,
+                "slow_queries": slow_queries,
+                "total_suggestions": total_suggestions,
+                "avg_execution_time_ms": round(avg_execution_time, 2),
+                "total_execution_time_ms": round(total_execution_time, 2),
+                "slow_query_percentage": round((slow_queries / total_queries * 100) if total_queries > 0 else 0, 2)
+            }
+
+        # Aggregates change slowly relative to dashboard polling; serve a
+        # short-lived cached copy instead of re-aggregating per request
+        return await response_cache.get_or_set("stats:overview", 30, compute_overview)
+
     except Exception as e:
         logger.error(f"Error getting system overview: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -78,56 +84,57 @@ async def get_performance_stats(
         Performance statistics
     """
     try:
-        # Get top 10 slowest queries
-        slowest_queries_result = await db.execute(
-            select(QueryLog)
-            .order_by(desc(QueryLog.mean_exec_time))
-            .limit(10)
+        return await response_cache.get_or_set(
+            "stats:performance", 30,
+            lambda: _compute_performance_stats(db)
         )
-        slowest_queries = slowest_queries_result.scalars().all()
-        
-        # Get execution time distribution
-        time_ranges = [
-            (0, 100, "0-100ms"),
-            (100, 500, "100-500ms"),
-            (500, 1000, "500ms-1s"),
-            (1000, 5000, "1s-5s"),
-            (5000, float('inf'), "5s+")
-        ]
-        
-        distribution = {}
-        for min_time, max_time, label in time_ranges:
-            if max_time == float('inf'):
-                count_result = await db.execute(
-                    select(func.count(QueryLog.id)).where(QueryLog.mean_exec_time >= min_time)
-                )
-            else:
-                count_result = await db.execute(
-                    select(func.count(QueryLog.id)).where(
-                        QueryLog.mean_exec_time >= min_time,
-                        QueryLog.mean_exec_time < max_time
-                    )
-                )
-            distribution[label] = count_result.scalar()
-        
-        return {
-            "slowest_queries": [
-                {
-                    "id": str(q.id),
-                    "query_text": q.query_text[:100] + "..." if len(q.query_text) > 100 else q.query_text,
-                    "mean_exec_time": q.mean_exec_time,
-                    "calls": q.calls
-                }
-                for q in slowest_queries
-            ],
-            "execution_time_distribution": distribution
-        }
-        
+
     except Exception as e:
         logger.error(f"Error getting performance stats: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+async def _compute_performance_stats(db: AsyncSession) -> Dict[str, Any]:
+    """Build the performance stats payload (cache miss path)."""
+    # Get top 10 slowest queries
+    slowest_queries_result = await db.execute(
+        select(QueryLog)
+        .order_by(desc(QueryLog.mean_exec_time))
+        .limit(10)
+    )
+    slowest_queries = slowest_queries_result.scalars().all()
+
+    # Get execution time distribution in a single bucketed GROUP BY
+    # instead of one COUNT query per time range
+    bucket_labels = ["0-100ms", "100-500ms", "500ms-1s", "1s-5s", "5s+"]
+    bucket = case(
+        (QueryLog.mean_exec_time < 100, "0-100ms"),
+        (QueryLog.mean_exec_time < 500, "100-500ms"),
+        (QueryLog.mean_exec_time < 1000, "500ms-1s"),
+        (QueryLog.mean_exec_time < 5000, "1s-5s"),
+        else_="5s+"
+    ).label("bucket")
+
+    distribution_result = await db.execute(
+        select(bucket, func.count(QueryLog.id)).group_by(bucket)
+    )
+    bucket_counts = dict(distribution_result.all())
+    distribution = {label: bucket_counts.get(label, 0) for label in bucket_labels}
+
+    return {
+        "slowest_queries": [
+            {
+                "id": str(q.id),
+                "query_text": q.query_text[:100] + "..." if len(q.query_text) > 100 else q.query_text,
+                "mean_exec_time": q.mean_exec_time,
+                "calls": q.calls
+            }
+            for q in slowest_queries
+        ],
+        "execution_time_distribution": distribution
+    }
+
+
 @router.get("/suggestions")
 async def get_suggestion_stats(
     db: AsyncSession = Depends(get_db)
@@ -195,48 +202,44 @@ async def get_trends(
         Trend data
     """
     try:
-        end_date = datetime.utcnow()
-        start_date = end_date - timedelta(days=days)
-        
-        # Get daily query counts
-        daily_queries_result = await db.execute(
-            select(
-                func.date(QueryLog.collected_at).label('date'),
-                func.count(QueryLog.id).label('count')
-            )
-            .where(QueryLog.collected_at >= start_date)
-            .group_by(func.date(QueryLog.collected_at))
-            .order_by(func.date(QueryLog.collected_at))
-        )
-        daily_queries = daily_queries_result.all()
-        
-        # Get daily slow query counts
-        daily_slow_queries_result = await db.execute(
-            select(
-                func.date(QueryLog.collected_at).label('date'),
-                func.count(QueryLog.id).label('count')
-            )
-            .where(
-                QueryLog.collected_at >= start_date,
-                QueryLog.mean_exec_time > 1000
-            )
-            .group_by(func.date(QueryLog.collected_at))
-            .order_by(func.date(QueryLog.collected_at))
+        return await response_cache.get_or_set(
+            f"stats:trends:{days}", 120,
+            lambda: _compute_trends(db, days)
         )
-        daily_slow_queries = daily_slow_queries_result.all()
-        
-        return {
-            "period_days": days,
-            "daily_queries": [
-                {"date": str(row.date), "count": row.count}
-                for row in daily_queries
-            ],
-            "daily_slow_queries": [
-                {"date": str(row.date), "count": row.count}
-                for row in daily_slow_queries
-            ]
-        }
-        
+
     except Exception as e:
         logger.error(f"Error getting trends: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+async def _compute_trends(db: AsyncSession, days: int) -> Dict[str, Any]:
+    """Build the trends payload (cache miss path)."""
+    end_date = datetime.utcnow()
+    start_date = end_date - timedelta(days=days)
+
+    # Get daily totals and slow-query counts in a single scan using a
+    # FILTER clause instead of two near-identical GROUP BY queries
+    day = func.date(QueryLog.collected_at).label('date')
+    daily_result = await db.execute(
+        select(
+            day,
+            func.count(QueryLog.id).label('count'),
+            func.count(QueryLog.id).filter(QueryLog.mean_exec_time > 1000).label('slow_count')
+        )
+        .where(QueryLog.collected_at >= start_date)
+        .group_by(day)
+        .order_by(day)
+    )
+    daily_rows = daily_result.all()
+
+    return {
+        "period_days": days,
+        "daily_queries": [
+            {"date": str(row.date), "count": row.count}
+            for row in daily_rows
+        ],
+        "daily_slow_queries": [
+            {"date": str(row.date), "count": row.slow_count}
+            for row in daily_rows
+        ]
+    } 
\ No newline at end of file
@@ -3,7 +3,7 @@ from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import bindparam, delete, func, select
 
 from app.db.session import get_db
 from app.models.query_log import QueryLog
@@ -13,10 +13,26 @@ from app.models.suggestion import Suggestion
 from app.schemas.suggestion import SuggestionResponse, SuggestionList
 from app.services.rule_engine import rule_engine
 from app.services.feature_extractor import feature_extractor
+from app.core.response_cache import response_cache
 from app.core.logger import logger
 
 router = APIRouter()
 
+# Hot statements hoisted to module scope with a bind parameter so the
+# Core compilation happens once per process, not per request
+_QUERY_WITH_CONTEXT_STMT = (
+    select(QueryLog, QueryFeature, ExecutionPlan)
+    .outerjoin(QueryFeature, QueryFeature.query_id == QueryLog.id)
+    .outerjoin(ExecutionPlan, ExecutionPlan.query_id == QueryLog.id)
+    .where(QueryLog.id == bindparam("qid"))
+)
+
+_SUGGESTION_COUNT_STMT = (
+    select(func.count())
+    .select_from(Suggestion)
+    .where(Suggestion.query_id == bindparam("qid"))
+)
+
 
 @router.get("/{query_id}", response_model=SuggestionList)
 async def get_suggestions(
@@ -34,45 +50,59 @@ async def get_suggestions(
         List of suggestions for the query
     """
     try:
-        # Get the query
-        result = await db.execute(select(QueryLog).where(QueryLog.id == query_id))
-        query_log = result.scalar_one_or_none()
-        
-        if not query_log:
-            raise HTTPException(status_code=404, detail="Query not found")
-        
-        # Get existing suggestions
-        suggestions = await rule_engine.get_suggestions_for_query(db, str(query_id))
-        
-        # If no suggestions exist, generate them
-        if not suggestions:
-            # Get query features
-            feature_result = await db.execute(
-                select(QueryFeature).where(QueryFeature.query_id == query_id)
-            )
-            query_feature = feature_result.scalar_one_or_none()
-            
-            # Get execution plan
-            plan_result = await db.execute(
-                select(ExecutionPlan).where(ExecutionPlan.query_id == query_id)
-            )
-            execution_plan = plan_result.scalar_one_or_none()
-            
-            # Generate new suggestions
-            suggestions = await rule_engine.generate_suggestions(
-                db, query_log, query_feature, execution_plan
-            )
-        
-        return SuggestionList(
-            suggestions=[SuggestionResponse.model_validate(s) for s in suggestions],
-            query_id=query_id,
-            total=len(suggestions)
+        async def compute_suggestions():
+            # Fetch the query together with its (effectively 1:1) feature and
+            # plan rows in one joined round-trip instead of three SELECTs
+            result = await db.execute(_QUERY_WITH_CONTEXT_STMT, {"qid": query_id})
+            row = result.first()
+
+            if not row or row[0] is None:
+                raise HTTPException(status_code=404, detail="Query not found")
+
+            query_log, query_feature, execution_plan = row
+
+            # Get existing suggestions
+            suggestions = await rule_engine.get_suggestions_for_query(db, str(query_id))
+
+            # If no suggestions exist, generate them from the already-loaded
+            # feature and plan rows
+            if not suggestions:
+                suggestions = await rule_engine.generate_suggestions(
+                    db, query_log, query_feature, execution_plan
+                )
+
+            # model_construct skips re-validation; the rows come from our
+            # own tables and match the schema by construction
+            return SuggestionList.model_construct(
+                suggestions=[
+                    SuggestionResponse.model_construct(
+                        id=s.id,
+                        query_id=s.query_id,
+                        suggestion_type=s.suggestion_type,
+                        message=s.message,
+                        confidence=s.confidence,
+                        source=s.source,
+                        estimated_improvement_ms=s.estimated_improvement_ms,
+                        implementation_cost=s.implementation_cost,
+                        created_at=s.created_at
+                    )
+                    for s in suggestions
+                ],
+                query_id=query_id,
+                total=len(suggestions)
+            ).model_dump(mode="json")
+
+        # Suggestions only change on POST /generate or DELETE, both of
+        # which invalidate this key, so reads can be served from cache
+        return await response_cache.get_or_set(
+            f"suggestions:{query_id}", 300, compute_suggestions
         )
-        
+
+
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting suggestions for query {query_id}: {e}")
+        logger.error("Error getting suggestions for query %s: %s", query_id, e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
@@ -92,30 +122,24 @@ async def generate_suggestions(
         Generation results
     """
     try:
-        # Get the query
-        result = await db.execute(select(QueryLog).where(QueryLog.id == query_id))
-        query_log = result.scalar_one_or_none()
-        
-        if not query_log:
+        # One joined round-trip for query, feature and plan; a gather
+        # over three selects is not an option on a single AsyncSession
+        result = await db.execute(_QUERY_WITH_CONTEXT_STMT, {"qid": query_id})
+        row = result.first()
+
+        if not row or row[0] is None:
             raise HTTPException(status_code=404, detail="Query not found")
-        
-        # Get query features
-        feature_result = await db.execute(
-            select(QueryFeature).where(QueryFeature.query_id == query_id)
-        )
-        query_feature = feature_result.scalar_one_or_none()
-        
-        # Get execution plan
-        plan_result = await db.execute(
-            select(ExecutionPlan).where(ExecutionPlan.query_id == query_id)
-        )
-        execution_plan = plan_result.scalar_one_or_none()
-        
+
+        query_log, query_feature, execution_plan = row
+
         # Generate suggestions
         suggestions = await rule_engine.generate_suggestions(
             db, query_log, query_feature, execution_plan
         )
-        
+
+        # Drop cached reads for this query
+        await response_cache.invalidate(f"suggestions:{query_id}")
+
         return {
             "message": f"Generated {len(suggestions)} suggestions for query {query_id}",
             "suggestions_count": len(suggestions),
@@ -125,7 +149,7 @@ async def generate_suggestions(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error generating suggestions for query {query_id}: {e}")
+        logger.error("Error generating suggestions for query %s: %s", query_id, e)
         raise HTTPException(status_code=500, detail="Failed to generate suggestions")
 
 
@@ -145,15 +169,22 @@ async def get_suggestion_count(
         Suggestion count
     """
     try:
-        suggestions = await rule_engine.get_suggestions_for_query(db, str(query_id))
-        
-        return {
-            "query_id": str(query_id),
-            "suggestion_count": len(suggestions)
-        }
-        
+        async def compute_count():
+            # Server-side COUNT instead of materializing every row
+            count = await db.scalar(_SUGGESTION_COUNT_STMT, {"qid": query_id})
+
+            return {
+                "query_id": str(query_id),
+                "suggestion_count": count or 0
+            }
+
+        return await response_cache.get_or_set(
+            f"suggestions:{query_id}:count", 300, compute_count
+        )
+
+
     except Exception as e:
-        logger.error(f"Error getting suggestion count for query {query_id}: {e}")
+        logger.error("Error getting suggestion count for query %s: %s", query_id, e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
@@ -173,21 +204,24 @@ async def delete_suggestions(
         Deletion results
     """
     try:
-        # Get existing suggestions
-        suggestions = await rule_engine.get_suggestions_for_query(db, str(query_id))
-        
-        # Delete them
-        for suggestion in suggestions:
-            await db.delete(suggestion)
-        
+        # Single bulk DELETE instead of loading every row and issuing
+        # one DELETE per suggestion
+        result = await db.execute(
+            delete(Suggestion).where(Suggestion.query_id == query_id)
+        )
         await db.commit()
-        
+
+        deleted_count = result.rowcount or 0
+
+        # Drop cached reads for this query
+        await response_cache.invalidate(f"suggestions:{query_id}")
+
         return {
-            "message": f"Deleted {len(suggestions)} suggestions for query {query_id}",
-            "deleted_count": len(suggestions),
+            "message": f"Deleted {deleted_count} suggestions for query {query_id}",
+            "deleted_count": deleted_count,
             "query_id": str(query_id)
         }
         
     except Exception as e:
-        logger.error(f"Error deleting suggestions for query {query_id}: {e}")
+        logger.error("Error deleting suggestions for query %s: %s", query_id, e)
         raise HTTPException(status_code=500, detail="Failed to delete suggestions") 
\ No newline at end of file
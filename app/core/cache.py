@@ -0,0 +1,67 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+
+class AsyncTTLCache:
+    """Small in-process TTL cache for expensive, read-mostly results.
+
+    Each key gets its own lock so concurrent requests for a cold key
+    trigger a single recomputation (single-flight) instead of a
+    thundering herd. The cache is bounded: once full, the entry closest
+    to expiry is evicted.
+    """
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    async def get_or_set(
+        self,
+        key: str,
+        ttl_seconds: float,
+        factory: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Return the cached value for key, computing it via factory if
+        missing or expired.
+
+        Args:
+            key: Cache key
+            ttl_seconds: How long the computed value stays fresh
+            factory: Coroutine function that produces the value
+
+        Returns:
+            The cached or freshly computed value
+        """
+        entry = self._entries.get(key)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Re-check after acquiring the lock; another task may have
+            # refreshed the entry while we waited
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                return entry[1]
+
+            value = await factory()
+
+            if key not in self._entries and len(self._entries) >= self.max_entries:
+                stalest = min(self._entries, key=lambda k: self._entries[k][0])
+                self._entries.pop(stalest, None)
+                self._locks.pop(stalest, None)
+
+            self._entries[key] = (time.monotonic() + ttl_seconds, value)
+            return value
+
+    def invalidate(self, prefix: str = "") -> None:
+        """Drop all entries whose key starts with prefix (all if empty)."""
+        for key in [k for k in self._entries if k.startswith(prefix)]:
+            self._entries.pop(key, None)
+
+
+# Shared cache for aggregate statistics endpoints
+stats_cache = AsyncTTLCache()
@@ -1,32 +1,44 @@
+import atexit
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 
 from app.core.config import settings
 
 
 def setup_logger(name: str = "queryiq") -> logging.Logger:
-    """Set up and configure logger for the application."""
-    
+    """Set up and configure logger for the application.
+
+    Records are handed to a background QueueListener thread so stdout
+    writes never block the event loop.
+    """
+
     logger = logging.getLogger(name)
-    
+
     if logger.handlers:  # Avoid adding handlers multiple times
         return logger
-    
+
     logger.setLevel(getattr(logging, settings.log_level.upper()))
-    
-    # Console handler
+
+    # Console handler, driven from a background thread
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.DEBUG)
-    
+
     # Formatter
     formatter = logging.Formatter(
         "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     )
     console_handler.setFormatter(formatter)
-    
-    logger.addHandler(console_handler)
-    
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, console_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+    logger.addHandler(QueueHandler(log_queue))
+
     return logger
 
 
@@ -0,0 +1,92 @@
+import json
+from typing import Any, Awaitable, Callable, Optional
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # pragma: no cover - redis is optional
+    aioredis = None
+
+from app.core.cache import stats_cache
+from app.core.config import settings
+from app.core.logger import logger
+
+
+class ResponseCache:
+    """JSON response cache shared across workers via Redis.
+
+    With several uvicorn workers an in-process cache still lets every
+    worker hit Postgres independently; a shared Redis cache serves the
+    whole fleet from one computation. When no redis_url is configured,
+    the redis package is missing, or the server is unreachable, this
+    falls back transparently to the in-process TTL cache so endpoints
+    never fail because of the cache.
+    """
+
+    def __init__(self, redis_url: Optional[str] = None):
+        self.redis_url = redis_url
+        self._client = None
+
+    def _get_client(self):
+        """Lazily create the Redis client (None when unavailable)."""
+        if aioredis is None or not self.redis_url:
+            return None
+        if self._client is None:
+            self._client = aioredis.from_url(self.redis_url, decode_responses=True)
+        return self._client
+
+    async def get_or_set(
+        self,
+        key: str,
+        ttl_seconds: int,
+        factory: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Return the cached JSON value for key, computing and storing it
+        via factory on a miss.
+
+        Args:
+            key: Cache key (e.g. "stats:trends:7")
+            ttl_seconds: Expiry for the stored value
+            factory: Coroutine function producing a JSON-serializable value
+
+        Returns:
+            The cached or freshly computed value
+        """
+        client = self._get_client()
+        if client is None:
+            return await stats_cache.get_or_set(key, ttl_seconds, factory)
+
+        try:
+            cached = await client.get(key)
+            if cached is not None:
+                return json.loads(cached)
+        except Exception as e:
+            logger.warning(f"Redis cache read failed for {key}: {e}")
+            return await stats_cache.get_or_set(key, ttl_seconds, factory)
+
+        value = await factory()
+
+        try:
+            await client.set(key, json.dumps(value, default=str), ex=ttl_seconds)
+        except Exception as e:
+            logger.warning(f"Redis cache write failed for {key}: {e}")
+
+        return value
+
+    async def invalidate(self, prefix: str) -> None:
+        """Drop matching entries from both the local and Redis tiers."""
+        stats_cache.invalidate(prefix)
+
+        client = self._get_client()
+        if client is None:
+            return
+        try:
+            keys = [key async for key in client.scan_iter(f"{prefix}*")]
+            if keys:
+                await client.delete(*keys)
+        except Exception as e:
+            logger.warning(f"Redis cache invalidation failed for {prefix}: {e}")
+
+
+# Shared response cache for the /stats endpoints
+response_cache = ResponseCache(settings.redis_url)
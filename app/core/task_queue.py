@@ -0,0 +1,54 @@
+from typing import Any
+
+try:
+    from arq import create_pool
+    from arq.connections import RedisSettings
+except ImportError:  # pragma: no cover - arq is optional
+    create_pool = None
+
+from app.core.config import settings
+from app.core.logger import logger
+
+
+class TaskQueue:
+    """Thin wrapper around an arq Redis job queue.
+
+    FastAPI BackgroundTasks run in-process after the response: they do
+    not survive restarts, cannot retry, and share the event loop and DB
+    pool with request handlers. Long benchmarks belong on dedicated
+    workers. enqueue returns False when the queue is unavailable (no
+    redis_url, arq not installed, Redis down) so callers can fall back
+    to BackgroundTasks.
+    """
+
+    def __init__(self, redis_url: str = None):
+        self.redis_url = redis_url
+        self._pool = None
+
+    async def enqueue(self, job_name: str, *args: Any, **kwargs: Any) -> bool:
+        """
+        Enqueue a job for the arq worker.
+
+        Args:
+            job_name: Name of the registered worker function
+            *args: Positional job arguments (must be picklable)
+            **kwargs: Keyword job arguments
+
+        Returns:
+            True if the job was queued, False if the queue is unavailable
+        """
+        if create_pool is None or not self.redis_url:
+            return False
+
+        try:
+            if self._pool is None:
+                self._pool = await create_pool(RedisSettings.from_dsn(self.redis_url))
+            await self._pool.enqueue_job(job_name, *args, **kwargs)
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to enqueue {job_name}: {e}")
+            return False
+
+
+# Global queue instance
+task_queue = TaskQueue(settings.redis_url)
@@ -4,7 +4,7 @@ from typing import List
 from uuid import uuid4
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import insert, select
 
 from app.db.session import AsyncSessionLocal
 from app.models.query_log import QueryLog
@@ -51,80 +51,90 @@ async def create_sample_data() -> None:
             }
         ]
         
-        query_logs = []
-        for query_data in sample_queries:
-            query_log = QueryLog(**query_data)
-            session.add(query_log)
-            query_logs.append(query_log)
-        
-        await session.commit()
-        
-        # Create sample execution plans
-        for query_log in query_logs:
-            plan = ExecutionPlan(
-                query_id=query_log.id,
-                plan_json={
+        # Core bulk insert: one executemany per table and a single commit
+        # instead of per-instance ORM adds with four commits
+        inserted = await session.execute(
+            insert(QueryLog)
+            .returning(QueryLog.id, QueryLog.query_text, QueryLog.mean_exec_time),
+            sample_queries
+        )
+        query_rows = inserted.all()
+
+        # Scan each query text once for the flags the batches below share
+        text_flags = {
+            row.id: (
+                "JOIN" in row.query_text,
+                "SELECT *" in row.query_text,
+                "WHERE" in row.query_text
+            )
+            for row in query_rows
+        }
+
+        plans = [
+            {
+                "query_id": row.id,
+                "plan_json": {
                     "Node Type": "Seq Scan",
                     "Total Cost": 100.0,
-                    "Actual Time": query_log.mean_exec_time,
+                    "Actual Time": row.mean_exec_time,
                     "Plan Rows": 1000,
                     "Actual Rows": 1000
                 },
-                total_cost=100.0,
-                actual_time=query_log.mean_exec_time,
-                plan_depth=1,
-                plan_type="EXPLAIN ANALYZE"
-            )
-            session.add(plan)
-        
-        await session.commit()
-        
-        # Create sample features
-        for query_log in query_logs:
-            feature = QueryFeature(
-                query_id=query_log.id,
-                num_joins=1 if "JOIN" in query_log.query_text else 0,
-                has_select_star="SELECT *" in query_log.query_text,
-                has_where_clause="WHERE" in query_log.query_text,
-                num_subqueries=0,
-                scan_types=["Seq Scan"],
-                indexed_tables_pct=50.0,
-                avg_table_size_mb=10.0,
-                is_slow_query=query_log.mean_exec_time > 100,
-                complexity_score=0.5
-            )
-            session.add(feature)
-        
-        await session.commit()
-        
-        # Create sample suggestions
-        for query_log in query_logs:
-            if "SELECT *" in query_log.query_text:
-                suggestion = Suggestion(
-                    query_id=query_log.id,
-                    suggestion_type="QUERY_REWRITE",
-                    message="Consider replacing SELECT * with specific column names to improve performance",
-                    confidence=0.8,
-                    source="RULE_ENGINE",
-                    estimated_improvement_ms=50.0,
-                    implementation_cost="LOW"
-                )
-                session.add(suggestion)
-            
-            if query_log.mean_exec_time > 100:
-                suggestion = Suggestion(
-                    query_id=query_log.id,
-                    suggestion_type="INDEX",
-                    message="Consider adding an index on frequently queried columns",
-                    confidence=0.7,
-                    source="HEURISTIC",
-                    estimated_improvement_ms=200.0,
-                    implementation_cost="MEDIUM"
-                )
-                session.add(suggestion)
-        
+                "total_cost": 100.0,
+                "actual_time": row.mean_exec_time,
+                "plan_depth": 1,
+                "plan_type": "EXPLAIN ANALYZE"
+            }
+            for row in query_rows
+        ]
+        await session.execute(insert(ExecutionPlan), plans)
+
+        features = [
+            {
+                "query_id": row.id,
+                "num_joins": 1 if text_flags[row.id][0] else 0,
+                "has_select_star": text_flags[row.id][1],
+                "has_where_clause": text_flags[row.id][2],
+                "num_subqueries": 0,
+                "scan_types": ["Seq Scan"],
+                "indexed_tables_pct": 50.0,
+                "avg_table_size_mb": 10.0,
+                "is_slow_query": row.mean_exec_time > 100,
+                "complexity_score": 0.5
+            }
+            for row in query_rows
+        ]
+        await session.execute(insert(QueryFeature), features)
+
+        suggestions = []
+        for row in query_rows:
+            if text_flags[row.id][1]:
+                suggestions.append({
+                    "query_id": row.id,
+                    "suggestion_type": "QUERY_REWRITE",
+                    "message": "Consider replacing SELECT * with specific column names to improve performance",
+                    "confidence": 0.8,
+                    "source": "RULE_ENGINE",
+                    "estimated_improvement_ms": 50.0,
+                    "implementation_cost": "LOW"
+                })
+
+            if row.mean_exec_time > 100:
+                suggestions.append({
+                    "query_id": row.id,
+                    "suggestion_type": "INDEX",
+                    "message": "Consider adding an index on frequently queried columns",
+                    "confidence": 0.7,
+                    "source": "HEURISTIC",
+                    "estimated_improvement_ms": 200.0,
+                    "implementation_cost": "MEDIUM"
+                })
+
+        if suggestions:
+            await session.execute(insert(Suggestion), suggestions)
+
         await session.commit()
-        
+
         logger.info("Sample data created successfully")
 
 
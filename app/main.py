@@ -1,9 +1,11 @@
 import asyncio
+import time
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.core.config import settings
 from app.core.logger import logger
@@ -20,17 +22,35 @@ async def lifespan(app: FastAPI):
     try:
         # Initialize database
         await init_db()
+
+        # Create the benchmark results table up front so the store path
+        # is a bare INSERT
+        from app.db.session import AsyncSessionLocal
+        from app.services.benchmark_engine import benchmark_engine
+        async with AsyncSessionLocal() as session:
+            await benchmark_engine.init(session)
+
         logger.info("Database initialized successfully")
         
-        # Load ML model
+        # Kick the ML model load off in the background so readiness is
+        # not blocked on model deserialization; prediction endpoints
+        # wait for it via ml_engine.wait_ready(). The task is pinned on
+        # app.state: the loop only keeps a weak reference, so an
+        # anonymous task could be garbage-collected mid-load and would
+        # swallow any exception it raised
         from app.services.ml_engine import ml_engine
-        await ml_engine.load_model()
-        logger.info("ML model loaded successfully")
-        
+
+        def _log_load_result(task: asyncio.Task) -> None:
+            if not task.cancelled() and task.exception() is not None:
+                logger.error("Background model load failed: %s", task.exception())
+
+        app.state.ml_load_task = asyncio.create_task(ml_engine.load_model())
+        app.state.ml_load_task.add_done_callback(_log_load_result)
+
         logger.info("QueryIQ application started successfully")
         
     except Exception as e:
-        logger.error(f"Failed to start application: {e}")
+        logger.error("Failed to start application: %s", e)
         raise
     
     yield
@@ -39,10 +59,14 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down QueryIQ application...")
     
     try:
+        from app.services.benchmark_engine import benchmark_engine
+        from app.services.query_collector import query_collector
+        await benchmark_engine.close()
+        await query_collector.close()
         await close_db()
         logger.info("Database connections closed")
     except Exception as e:
-        logger.error(f"Error during shutdown: {e}")
+        logger.error("Error during shutdown: %s", e)
 
 
 # Create FastAPI application
@@ -52,16 +76,38 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
-# Add CORS middleware
+# Compress sizeable list/stats payloads; small responses are sent as-is
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+@app.middleware("http")
+async def timing_middleware(request, call_next):
+    """Record per-request latency and warn on slow responses.
+
+    perf_counter_ns keeps the measurement integer-only; the threshold
+    reuses the slow_query_threshold_ms setting.
+    """
+    t0 = time.perf_counter_ns()
+    response = await call_next(request)
+    dt_ms = (time.perf_counter_ns() - t0) / 1e6
+
+    if dt_ms > settings.slow_query_threshold_ms:
+        logger.warning("slow_request path=%s ms=%.2f", request.url.path, dt_ms)
+
+    response.headers["x-response-ms"] = f"{dt_ms:.2f}"
+    return response
+
+
+# Add CORS middleware with a concrete allowlist so the headers are
+# built once instead of reflected on every preflight
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Configure appropriately for production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=settings.cors_origins,
+    allow_methods=["GET", "POST", "DELETE"],
+    allow_headers=["content-type", "authorization"],
 )
 
 # Include API routes
@@ -101,19 +147,24 @@ async def root():
     }
 
 
-@app.get("/health")
+# Static part of the health payload, encoded once; liveness probes hit
+# this endpoint far too often to pay serialization per request
+_HEALTH_BODY_PREFIX = b'{"status":"healthy","timestamp":'
+
+
+@app.get("/health", include_in_schema=False)
 async def health_check():
     """Health check endpoint."""
-    return {
-        "status": "healthy",
-        "timestamp": "2024-01-01T00:00:00Z"  # In reality, use actual timestamp
-    }
+    return Response(
+        content=_HEALTH_BODY_PREFIX + str(time.time()).encode() + b"}",
+        media_type="application/json"
+    )
 
 
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
     """Custom HTTP exception handler."""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "error": exc.detail,
@@ -125,8 +176,8 @@ async def http_exception_handler(request, exc):
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
     """General exception handler."""
-    logger.error(f"Unhandled exception: {exc}")
-    return JSONResponse(
+    logger.error("Unhandled exception: %s", exc)
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": "Internal server error",
@@ -136,12 +187,21 @@ async def general_exception_handler(request, exc):
 
 
 if __name__ == "__main__":
+    import os
+
     import uvicorn
-    
+
+    # uvloop and httptools replace the pure-Python event loop and HTTP
+    # parser; reload mode is single-process, so only scale workers in
+    # production where access logging is also disabled
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
         port=8000,
         reload=settings.debug,
-        log_level=settings.log_level.lower()
-    ) 
\ No newline at end of file
+        log_level=settings.log_level.lower(),
+        loop="uvloop",
+        http="httptools",
+        workers=1 if settings.debug else (os.cpu_count() or 1),
+        access_log=settings.debug
+    )
\ No newline at end of file
@@ -1 +1,18 @@
-# Models package 
\ No newline at end of file
+# Models package
+#
+# Import every mapped class so string references in relationship()
+# (e.g. QueryLog.suggestions -> "Suggestion") resolve regardless of
+# which model a caller imports first.
+from app.models.base import Base
+from app.models.execution_plan import ExecutionPlan
+from app.models.features import QueryFeature
+from app.models.query_log import QueryLog
+from app.models.suggestion import Suggestion
+
+__all__ = [
+    "Base",
+    "ExecutionPlan",
+    "QueryFeature",
+    "QueryLog",
+    "Suggestion",
+]
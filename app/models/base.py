@@ -1,8 +1,8 @@
+import operator
 import uuid
-from datetime import datetime
 from typing import Any, Dict
 
-from sqlalchemy import Column, DateTime, String
+from sqlalchemy import Column, DateTime, String, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import DeclarativeBase
@@ -10,17 +10,35 @@ from sqlalchemy.orm import DeclarativeBase
 
 class Base(DeclarativeBase):
     """Base class for all database models."""
-    
+
+    # Timestamps are generated server-side: no Python datetime
+    # construction or extra bind parameter per insert, and TIMESTAMPTZ
+    # keeps them timezone-safe
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False
+    )
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert model instance to dictionary."""
-        return {
-            column.name: getattr(self, column.name)
-            for column in self.__table__.columns
-        }
+        """Convert model instance to dictionary.
+
+        The column-name tuple and a C-level attrgetter are cached on
+        the class on first use, so repeated calls skip the Table
+        traversal and per-attribute Python dispatch.
+        """
+        cls = type(self)
+        getter = cls.__dict__.get("_column_getter")
+        if getter is None:
+            cls._column_names = tuple(c.name for c in cls.__table__.columns)
+            cls._column_getter = getter = operator.attrgetter(*cls._column_names)
+        values = getter(self)
+        if len(cls._column_names) == 1:
+            values = (values,)
+        return dict(zip(cls._column_names, values))
     
     def __repr__(self) -> str:
         """String representation of the model."""
@@ -1,22 +1,30 @@
 from typing import Optional
 
-from sqlalchemy import Column, Float, Integer, String, Text
+from sqlalchemy import Column, Float, ForeignKey, Integer, String, Text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 
 from app.models.base import Base
 
 
 class ExecutionPlan(Base):
     """Model for storing parsed EXPLAIN execution plans."""
-    
+
     __tablename__ = "execution_plans"
+
+    # Foreign key to query log; unique because plans are 1:1 with queries,
+    # which lets the planner use single-row index scans
+    query_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("query_logs.id", ondelete="CASCADE"),
+        nullable=False,
+        unique=True
+    )
     
-    # Foreign key to query log
-    query_id = Column(UUID(as_uuid=True), nullable=False, index=True)
-    
-    # Plan data
-    plan_json = Column(JSONB, nullable=False)
+    # Plan data; deferred so the (potentially tens-of-KB) EXPLAIN blob
+    # is not transferred and decoded on every entity fetch — consumers
+    # that need it undefer or project server-side
+    plan_json = deferred(Column(JSONB, nullable=False))
     
     # Performance metrics from plan
     total_cost = Column(Float, nullable=True)
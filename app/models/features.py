@@ -1,6 +1,6 @@
 from typing import Optional
 
-from sqlalchemy import Column, Boolean, Float, Integer, String
+from sqlalchemy import Column, Boolean, Float, ForeignKey, Integer, String
 from sqlalchemy.dialects.postgresql import UUID, ARRAY
 
 from app.models.base import Base
@@ -8,11 +8,16 @@ from app.models.base import Base
 
 class QueryFeature(Base):
     """Model for storing extracted features from queries and execution plans."""
-    
+
     __tablename__ = "query_features"
-    
-    # Foreign key to query log
-    query_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+
+    # Foreign key to query log; unique because features are 1:1 with queries
+    query_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("query_logs.id", ondelete="CASCADE"),
+        nullable=False,
+        unique=True
+    )
     
     # Query structure features
     num_joins = Column(Integer, nullable=False, default=0)
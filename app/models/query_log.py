@@ -1,8 +1,8 @@
-from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Column, DateTime, Float, Integer, String, Text
+from sqlalchemy import Column, DateTime, Float, Integer, String, Text, func
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
 
 from app.models.base import Base
 
@@ -26,7 +26,10 @@ class QueryLog(Base):
     calls = Column(Integer, nullable=False, default=0)
     
     # Collection metadata
-    collected_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    collected_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    # Suggestions generated for this query
+    suggestions = relationship("Suggestion", viewonly=True)
     
     def __repr__(self) -> str:
         """String representation of the query log."""
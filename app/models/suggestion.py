@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Column, DateTime, Float, String, Text
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, String, Text
 from sqlalchemy.dialects.postgresql import UUID
 
 from app.models.base import Base
@@ -9,11 +9,20 @@ from app.models.base import Base
 
 class Suggestion(Base):
     """Model for storing query optimization suggestions."""
-    
+
     __tablename__ = "suggestions"
-    
+
+    # Composite index covers both by-query lookups and by-query-and-type
+    __table_args__ = (
+        Index("ix_suggestions_query_id_type", "query_id", "suggestion_type"),
+    )
+
     # Foreign key to query log
-    query_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    query_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("query_logs.id", ondelete="CASCADE"),
+        nullable=False
+    )
     
     # Suggestion details
     suggestion_type = Column(String(100), nullable=False)  # e.g., "INDEX", "QUERY_REWRITE", "CONFIGURATION"
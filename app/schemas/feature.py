@@ -1,7 +1,7 @@
 from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class QueryFeatureBase(BaseModel):
@@ -26,9 +26,8 @@ class QueryFeatureCreate(QueryFeatureBase):
 class QueryFeatureResponse(QueryFeatureBase):
     """Schema for query feature response."""
     id: UUID
-    
-    class Config:
-        from_attributes = True
+
+    model_config = ConfigDict(from_attributes=True)
 
 
 class FeatureVector(BaseModel):
@@ -36,6 +35,5 @@ class FeatureVector(BaseModel):
     query_id: UUID
     features: dict[str, float] = Field(..., description="Feature vector for ML model")
     target: Optional[float] = Field(None, description="Target value for training (execution time)")
-    
-    class Config:
-        from_attributes = True 
\ No newline at end of file
+
+    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
@@ -1,7 +1,7 @@
 from typing import Any, Dict, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class ExecutionPlanBase(BaseModel):
@@ -22,9 +22,8 @@ class ExecutionPlanCreate(ExecutionPlanBase):
 class ExecutionPlanResponse(ExecutionPlanBase):
     """Schema for execution plan response."""
     id: UUID
-    
-    class Config:
-        from_attributes = True
+
+    model_config = ConfigDict(from_attributes=True)
 
 
 class PlanAnalysis(BaseModel):
@@ -40,6 +39,5 @@ class PlanAnalysis(BaseModel):
     has_index_scan: bool = Field(..., description="Whether plan uses index scans")
     estimated_rows: Optional[int] = Field(None, description="Estimated number of rows")
     actual_rows: Optional[int] = Field(None, description="Actual number of rows")
-    
-    class Config:
-        from_attributes = True 
\ No newline at end of file
+
+    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
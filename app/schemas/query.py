@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class QueryLogBase(BaseModel):
@@ -25,17 +25,17 @@ class QueryLogResponse(QueryLogBase):
     """Schema for query log response."""
     id: UUID
     collected_at: datetime
-    
-    class Config:
-        from_attributes = True
+
+    model_config = ConfigDict(from_attributes=True)
 
 
 class QueryLogList(BaseModel):
     """Schema for list of query logs."""
     queries: list[QueryLogResponse]
-    total: int
-    page: int
+    total: Optional[int] = Field(None, description="Exact total, only computed when requested")
+    page: Optional[int] = None
     size: int
+    next_cursor: Optional[str] = Field(None, description="Keyset cursor for the next page")
 
 
 class SlowQueryResponse(BaseModel):
@@ -48,6 +48,5 @@ class SlowQueryResponse(BaseModel):
     total_exec_time: float
     collected_at: datetime
     is_slow: bool = Field(..., description="Whether this query is considered slow")
-    
-    class Config:
-        from_attributes = True 
\ No newline at end of file
+
+    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class SuggestionBase(BaseModel):
@@ -25,9 +25,8 @@ class SuggestionResponse(SuggestionBase):
     """Schema for suggestion response."""
     id: UUID
     created_at: datetime
-    
-    class Config:
-        from_attributes = True
+
+    model_config = ConfigDict(from_attributes=True)
 
 
 class SuggestionList(BaseModel):
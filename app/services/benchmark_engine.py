@@ -1,13 +1,14 @@
 import asyncio
+import json
 import time
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from dataclasses import dataclass
-import statistics
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text, select
+from sqlalchemy import bindparam, text, select
 import asyncpg
+import numpy as np
 
 from app.models.query_log import QueryLog
 from app.models.suggestion import Suggestion
@@ -16,7 +17,10 @@ from app.core.logger import logger
 from app.core.config import settings
 
 
-@dataclass
+# slots=True drops the per-instance __dict__, which matters when sweep
+# mode accumulates thousands of results; not frozen because result_id
+# is assigned after the INSERT returns
+@dataclass(slots=True)
 class BenchmarkResult:
     """Result of a query benchmark test."""
     query_id: str
@@ -32,6 +36,23 @@ class BenchmarkResult:
     error_message: Optional[str] = None
     confidence: float = 0.0
     optimization_type: str = "UNKNOWN"
+    # Row id assigned by the INSERT ... RETURNING when the result is stored
+    result_id: Optional[str] = None
+    # Robust statistics of the original query's samples after outlier
+    # rejection, plus how many iterations errored out entirely
+    median_ms: float = 0.0
+    stdev_ms: float = 0.0
+    failed_iters: int = 0
+    # "warm" (iterations share hot caches) or "cache_busted" (session
+    # state discarded between iterations); improvement_pct is only
+    # comparable between runs of the same mode
+    cache_mode: str = "warm"
+    # Percentiles of the original query's timed runs; qps is only
+    # populated by the concurrent benchmark mode
+    p50_ms: float = 0.0
+    p95_ms: float = 0.0
+    p99_ms: float = 0.0
+    qps: float = 0.0
 
 
 class BenchmarkEngine:
@@ -39,28 +60,126 @@ class BenchmarkEngine:
     
     def __init__(self, db_url: str):
         self.db_url = db_url
-    
+        self._pool: Optional[asyncpg.Pool] = None
+        self._pool_lock = asyncio.Lock()
+        # Per-table column cache; information_schema joins several
+        # system catalogs, and schemas are effectively static within a
+        # benchmark session
+        self._schema_cache: Dict[str, Tuple[List[str], float]] = {}
+        self._schema_ttl = 300.0
+        # Plan JSON captured from the most recent benchmark's first
+        # iteration; lets callers feed plan_parser without a second
+        # EXPLAIN round-trip
+        self.last_plan_json: Optional[Dict[str, Any]] = None
+
+    async def _get_pool(self) -> asyncpg.Pool:
+        """Lazily create the shared benchmark connection pool."""
+        if self._pool is None:
+            async with self._pool_lock:
+                if self._pool is None:
+                    # The implicit statement cache must stay off: the
+                    # cache-bust mode issues DISCARD ALL, which drops
+                    # server-side prepared statements behind asyncpg's
+                    # back and turns every later fetch on that
+                    # connection into InvalidSQLStatementNameError.
+                    # Paths that reuse a statement prepare it explicitly.
+                    self._pool = await asyncpg.create_pool(
+                        self.db_url,
+                        min_size=2,
+                        max_size=10,
+                        max_inactive_connection_lifetime=300,
+                        command_timeout=60,
+                        statement_cache_size=0
+                    )
+        return self._pool
+
+    async def close(self) -> None:
+        """Close the benchmark pool; called from application shutdown."""
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    async def init(self, session: AsyncSession) -> None:
+        """Create the benchmark results table and its index once at boot.
+
+        Keeping DDL out of the insert path saves a round-trip and an
+        ACCESS EXCLUSIVE lock check per stored result.
+        """
+        await session.execute(text("""
+            CREATE TABLE IF NOT EXISTS performance_improvements (
+                id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+                query_id UUID,
+                original_query TEXT,
+                optimized_query TEXT,
+                original_avg_ms FLOAT,
+                optimized_avg_ms FLOAT,
+                improvement_pct FLOAT,
+                improvement_ms FLOAT,
+                confidence FLOAT,
+                optimization_type VARCHAR(100),
+                success BOOLEAN,
+                error_message TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """))
+
+        # Supports the anti-join that excludes recently benchmarked
+        # queries from batch runs
+        await session.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_pi_queryid_created
+            ON performance_improvements (query_id, created_at DESC)
+        """))
+
+        await session.commit()
+
+
     async def run_comprehensive_benchmark(
         self, 
         session: AsyncSession,
         query_log: QueryLog,
         suggestions: List[Suggestion],
-        iterations: int = 5
+        iterations: int = 5,
+        cache_bust: bool = False
     ) -> BenchmarkResult:
         """
         Run a complete benchmark: optimize query with Gemini, then measure performance.
-        
+
         Args:
             session: Database session
             query_log: Original query log
             suggestions: Optimization suggestions
             iterations: Number of test runs for averaging
-            
+            cache_bust: Discard session state between iterations to
+                approximate steady-state rather than hot-cache timings
+
         Returns:
             BenchmarkResult with performance comparison
         """
+        # Queries already under the slow-query threshold have nothing to
+        # gain; skip before spending a paid, network-bound Gemini call
+        if (query_log.mean_exec_time or 0) < settings.slow_query_threshold_ms:
+            logger.info(
+                "Skipping benchmark for query %s: %.1fms is below the "
+                "%sms threshold",
+                query_log.id, query_log.mean_exec_time or 0,
+                settings.slow_query_threshold_ms
+            )
+            return BenchmarkResult(
+                query_id=str(query_log.id),
+                original_query=query_log.query_text,
+                optimized_query=query_log.query_text,
+                original_times=[],
+                optimized_times=[],
+                original_avg_ms=0.0,
+                optimized_avg_ms=0.0,
+                improvement_pct=0.0,
+                improvement_ms=0.0,
+                success=False,
+                error_message="below threshold"
+            )
+
         logger.info(f"Starting benchmark for query {query_log.id}")
-        
+
         try:
             # Step 1: Get table schemas for context
             table_schemas = await self._extract_table_schemas(session, query_log.query_text)
@@ -73,19 +192,26 @@ class BenchmarkEngine:
             )
             
             # Step 3: Benchmark both queries
-            original_times = await self._benchmark_query(
-                query_log.query_text, 
-                iterations
+            original_times, original_failed = await self._benchmark_query(
+                query_log.query_text,
+                iterations,
+                cache_bust=cache_bust
             )
-            
-            optimized_times = await self._benchmark_query(
-                optimization_result.optimized_query, 
-                iterations
+
+            optimized_times, optimized_failed = await self._benchmark_query(
+                optimization_result.optimized_query,
+                iterations,
+                cache_bust=cache_bust
             )
-            
-            # Step 4: Calculate improvement metrics
-            original_avg = statistics.mean(original_times)
-            optimized_avg = statistics.mean(optimized_times)
+
+            # Step 4: Calculate improvement metrics on MAD-filtered
+            # samples so a stray autovacuum or lock wait cannot skew the
+            # comparison; failed iterations are counted, not folded in
+            # as sentinel times
+            original_clean = self._reject_outliers(original_times)
+            optimized_clean = self._reject_outliers(optimized_times)
+            original_avg = float(np.median(original_clean)) if original_clean.size else 0.0
+            optimized_avg = float(np.median(optimized_clean)) if optimized_clean.size else 0.0
             improvement_ms = original_avg - optimized_avg
             improvement_pct = (improvement_ms / original_avg) * 100 if original_avg > 0 else 0
             
@@ -101,7 +227,12 @@ class BenchmarkEngine:
                 improvement_ms=improvement_ms,
                 success=True,
                 confidence=optimization_result.confidence,
-                optimization_type=optimization_result.optimization_type
+                optimization_type=optimization_result.optimization_type,
+                cache_mode="cache_busted" if cache_bust else "warm",
+                median_ms=original_avg,
+                stdev_ms=float(original_clean.std(ddof=1)) if original_clean.size > 1 else 0.0,
+                failed_iters=original_failed + optimized_failed,
+                **dict(zip(("p50_ms", "p95_ms", "p99_ms"), self._percentiles(original_times)))
             )
             
             # Step 5: Store results
@@ -126,85 +257,267 @@ class BenchmarkEngine:
                 error_message=str(e)
             )
     
-    async def _benchmark_query(self, query: str, iterations: int = 5) -> List[float]:
+    async def _benchmark_query(
+        self,
+        query: str,
+        iterations: int = 5,
+        warmup: int = 2,
+        cache_bust: bool = False,
+        min_iter_gap: float = 0.0
+    ) -> Tuple[List[float], int]:
         """
         Execute a query multiple times and measure execution times.
-        
+
         Args:
             query: SQL query to benchmark
             iterations: Number of times to run the query
-            
+            warmup: Untimed runs of the actual query before measuring,
+                so plan and buffer cache effects don't inflate the
+                first samples (skipped when cache busting)
+            cache_bust: Run DISCARD ALL between iterations so each
+                timed run starts from a comparable session state
+                instead of fully warmed caches
+            min_iter_gap: Seconds to sleep between iterations; defaults
+                to 0 since warmed-up back-to-back runs are the point of
+                the exercise, but callers sharing a production database
+                can opt into throttling
+
         Returns:
-            List of execution times in milliseconds
+            Tuple of (execution times in milliseconds, failed iterations)
         """
         times = []
-        
+        failed = 0
+        self.last_plan_json = None
+
         try:
-            conn = await asyncpg.connect(self.db_url)
-            
-            # Warm up the connection
-            await conn.execute("SELECT 1")
-            
-            for i in range(iterations):
-                start_time = time.perf_counter()
-                
+            # Acquire from the shared pool: the TCP + auth handshake of a
+            # fresh connect would dominate fast queries and skew timings
+            pool = await self._get_pool()
+            async with pool.acquire() as conn:
+                # EXPLAIN ANALYZE runs the query server-side and reports
+                # its execution time, so iterations stop paying for (and
+                # measuring) result-set transfer; the surrounding
+                # transaction is rolled back so DML stays side-effect free
+                explain_query = f"EXPLAIN (ANALYZE, FORMAT JSON) {query}"
+
+                if cache_bust:
+                    # DISCARD ALL cannot run inside a transaction block,
+                    # so this mode rolls back per iteration and resets
+                    # session state (plan cache, temp state) in between
+                    for i in range(iterations):
+                        transaction = conn.transaction()
+                        await transaction.start()
+                        try:
+                            plan = await conn.fetchval(explain_query)
+                            times.append(self._plan_time_ms(json.loads(plan)))
+                        except Exception as e:
+                            logger.warning(f"Query execution failed on iteration {i+1}: {e}")
+                            failed += 1
+                        finally:
+                            await transaction.rollback()
+
+                        await conn.execute("DISCARD ALL")
+                        if min_iter_gap > 0:
+                            await asyncio.sleep(min_iter_gap)
+
+                    return times, failed
+
+                transaction = conn.transaction()
+                await transaction.start()
                 try:
-                    # Execute query and fetch results to ensure full execution
-                    result = await conn.fetch(query)
-                    
-                    end_time = time.perf_counter()
-                    execution_time_ms = (end_time - start_time) * 1000
-                    times.append(execution_time_ms)
-                    
-                    # Small delay between iterations
-                    await asyncio.sleep(0.1)
-                    
-                except Exception as e:
-                    logger.warning(f"Query execution failed on iteration {i+1}: {e}")
-                    # Use a high time to indicate failure
-                    times.append(10000.0)
-            
-            await conn.close()
-            
+                    # Prepare once so the server parses the EXPLAIN text a
+                    # single time; every warmup and timed run then only
+                    # pays Bind/Execute
+                    stmt = await conn.prepare(explain_query)
+
+                    # Warm up with the actual query so the timed loop never
+                    # measures cold plan or buffer caches
+                    for _ in range(warmup):
+                        try:
+                            await stmt.fetchval()
+                        except Exception:
+                            break
+
+                    for i in range(iterations):
+                        try:
+                            plan = await stmt.fetchval()
+                            times.append(self._plan_time_ms(json.loads(plan)))
+
+                            if min_iter_gap > 0:
+                                await asyncio.sleep(min_iter_gap)
+
+                        except Exception as e:
+                            logger.warning(f"Query execution failed on iteration {i+1}: {e}")
+                            failed += 1
+                finally:
+                    await transaction.rollback()
+
         except Exception as e:
             logger.error(f"Benchmark connection failed: {e}")
-            times = [10000.0] * iterations  # Fallback times
-        
-        return times
+            return [], iterations
+
+        return times, failed
     
+    @staticmethod
+    def _reject_outliers(times: List[float]) -> np.ndarray:
+        """Drop samples more than 3 MADs from the median.
+
+        Runs as vectorized numpy passes rather than Python-level loops;
+        a zero MAD (identical samples) disables filtering rather than
+        rejecting everything.
+        """
+        arr = np.asarray(times, dtype=np.float64)
+        if arr.size < 3:
+            return arr
+        med = np.median(arr)
+        mad = np.median(np.abs(arr - med))
+        if mad == 0:
+            return arr
+        return arr[np.abs(arr - med) <= 3 * mad]
+
+    def _plan_time_ms(self, plan: List[Dict[str, Any]]) -> float:
+        """Total server-side cost of one EXPLAIN ANALYZE run.
+
+        Planning Time is included because a regressed plan search is a
+        real cost of the query; the first plan seen is kept on
+        last_plan_json for reuse by plan analysis.
+        """
+        node = plan[0]
+        if self.last_plan_json is None:
+            # The parser expects the inner plan node, not the EXPLAIN
+            # wrapper that carries the timing fields
+            self.last_plan_json = node.get("Plan", node)
+        return float(node.get("Execution Time", 0.0)) + float(node.get("Planning Time", 0.0))
+
+    @staticmethod
+    def _percentiles(times: List[float]) -> Tuple[float, float, float]:
+        """Return (p50, p95, p99) of a sample list in milliseconds."""
+        if not times:
+            return 0.0, 0.0, 0.0
+        p50, p95, p99 = np.percentile(np.asarray(times, dtype=np.float64), [50, 95, 99])
+        return float(p50), float(p95), float(p99)
+
+    async def _benchmark_query_concurrent(
+        self,
+        query: str,
+        iterations: int = 20,
+        concurrency: int = 4
+    ) -> Tuple[List[float], int, float]:
+        """
+        Run benchmark iterations across concurrent pool connections.
+
+        Sequential timing measures single-client latency only; driving
+        several connections at once exposes contention effects and
+        yields a throughput figure. Failed iterations are counted, not
+        folded in as sentinel times.
+
+        Args:
+            query: SQL query to benchmark
+            iterations: Total iterations, split across workers
+            concurrency: Number of concurrent connections
+
+        Returns:
+            Tuple of (execution times in ms, failed iteration count,
+            achieved queries/second)
+        """
+        pool = await self._get_pool()
+        explain_query = f"EXPLAIN (ANALYZE, FORMAT JSON) {query}"
+        per_worker = max(1, iterations // concurrency)
+
+        async def worker() -> Tuple[List[float], int]:
+            samples = []
+            failed = 0
+            async with pool.acquire() as conn:
+                transaction = conn.transaction()
+                await transaction.start()
+                try:
+                    # Explicit prepare: the pool runs with the implicit
+                    # statement cache disabled, and parsing once per
+                    # worker keeps parse time out of the QPS figure
+                    stmt = await conn.prepare(explain_query)
+                    for i in range(per_worker):
+                        try:
+                            plan = await stmt.fetchval()
+                            samples.append(self._plan_time_ms(json.loads(plan)))
+                        except Exception as e:
+                            logger.warning(f"Concurrent benchmark iteration failed: {e}")
+                            failed += 1
+                finally:
+                    await transaction.rollback()
+            return samples, failed
+
+        start = time.perf_counter()
+        worker_results = await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+        times = [t for samples, _ in worker_results for t in samples]
+        failed_iters = sum(failed for _, failed in worker_results)
+        qps = len(times) / elapsed if elapsed > 0 else 0.0
+        return times, failed_iters, qps
+
+    @staticmethod
+    def _find_table_names(query: str) -> set:
+        """Resolve referenced table names from the SQL AST, falling
+        back to a FROM/JOIN regex when sqlglot cannot parse the query."""
+        try:
+            import sqlglot
+            from sqlglot import exp
+
+            tree = sqlglot.parse_one(query, read="postgres")
+            return {table.name for table in tree.find_all(exp.Table) if table.name}
+        except Exception:
+            import re
+            table_pattern = r'\b(?:FROM|JOIN)\s+([a-zA-Z_][a-zA-Z0-9_]*)\b'
+            return set(re.findall(table_pattern, query, re.IGNORECASE))
+
     async def _extract_table_schemas(
-        self, 
-        session: AsyncSession, 
+        self,
+        session: AsyncSession,
         query: str
     ) -> Dict[str, List[str]]:
         """Extract table schemas for tables used in the query."""
         schemas = {}
-        
+
         try:
-            # Simple regex to find table names (this could be improved with SQL parsing)
-            import re
-            table_pattern = r'\b(?:FROM|JOIN)\s+([a-zA-Z_][a-zA-Z0-9_]*)\b'
-            tables = set(re.findall(table_pattern, query, re.IGNORECASE))
-            
+            tables = self._find_table_names(query)
+            if not tables:
+                return schemas
+
+            # Serve fresh cache entries locally; only missing or expired
+            # tables go to the database
+            now = time.monotonic()
+            to_fetch = []
             for table in tables:
-                # Get column names from information_schema
-                column_query = text("""
-                    SELECT column_name 
-                    FROM information_schema.columns 
-                    WHERE table_name = :table_name 
-                    AND table_schema = 'public'
-                    ORDER BY ordinal_position
-                """)
-                
-                result = await session.execute(column_query, {"table_name": table})
-                columns = [row[0] for row in result.fetchall()]
-                
-                if columns:
-                    schemas[table] = columns
-                    
+                cached = self._schema_cache.get(table)
+                if cached is not None and now - cached[1] < self._schema_ttl:
+                    schemas[table] = cached[0]
+                else:
+                    to_fetch.append(table)
+
+            if not to_fetch:
+                return schemas
+
+            # One round-trip for all tables instead of a query per table
+            columns_query = text("""
+                SELECT table_name, column_name
+                FROM information_schema.columns
+                WHERE table_name IN :table_names
+                AND table_schema = 'public'
+                ORDER BY table_name, ordinal_position
+            """).bindparams(bindparam("table_names", expanding=True))
+
+            result = await session.execute(columns_query, {"table_names": to_fetch})
+
+            for table_name, column_name in result.fetchall():
+                schemas.setdefault(table_name, []).append(column_name)
+
+            for table in to_fetch:
+                if table in schemas:
+                    self._schema_cache[table] = (schemas[table], now)
+
         except Exception as e:
             logger.warning(f"Failed to extract table schemas: {e}")
-        
+
         return schemas
     
     async def _store_benchmark_result(
@@ -214,26 +527,7 @@ class BenchmarkEngine:
     ):
         """Store benchmark results in the database."""
         try:
-            # Create the performance_improvements table if it doesn't exist
-            await session.execute(text("""
-                CREATE TABLE IF NOT EXISTS performance_improvements (
-                    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-                    query_id UUID,
-                    original_query TEXT,
-                    optimized_query TEXT,
-                    original_avg_ms FLOAT,
-                    optimized_avg_ms FLOAT,
-                    improvement_pct FLOAT,
-                    improvement_ms FLOAT,
-                    confidence FLOAT,
-                    optimization_type VARCHAR(100),
-                    success BOOLEAN,
-                    error_message TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """))
-            
-            # Insert the benchmark result
+            # Insert the benchmark result (table created once by init())
             insert_query = text("""
                 INSERT INTO performance_improvements (
                     query_id, original_query, optimized_query, original_avg_ms,
@@ -244,9 +538,10 @@ class BenchmarkEngine:
                     :optimized_avg_ms, :improvement_pct, :improvement_ms, :confidence,
                     :optimization_type, :success, :error_message
                 )
+                RETURNING id
             """)
-            
-            await session.execute(insert_query, {
+
+            inserted = await session.execute(insert_query, {
                 "query_id": result.query_id,
                 "original_query": result.original_query,
                 "optimized_query": result.optimized_query,
@@ -259,14 +554,101 @@ class BenchmarkEngine:
                 "success": result.success,
                 "error_message": result.error_message
             })
-            
+            result.result_id = str(inserted.scalar_one())
+
             await session.commit()
+
+            # New results make cached aggregate stats stale
+            from app.core.cache import stats_cache
+            stats_cache.invalidate("benchmark:")
+            stats_cache.invalidate("stats:")
+
             logger.info(f"Stored benchmark result for query {result.query_id}")
             
         except Exception as e:
             logger.error(f"Failed to store benchmark result: {e}")
             await session.rollback()
     
+    async def _store_benchmark_results_bulk(
+        self,
+        session: AsyncSession,
+        results: List[BenchmarkResult]
+    ) -> None:
+        """Store a sweep's benchmark results in one write.
+
+        Per-result commits pay one WAL fsync each; batching collapses
+        them to one. Large batches go through COPY on the raw pool,
+        which beats INSERT by a wide margin for bulk writes.
+        """
+        if not results:
+            return
+
+        try:
+            if len(results) > 50:
+                import uuid as _uuid
+
+                pool = await self._get_pool()
+                records = [
+                    (
+                        _uuid.UUID(r.query_id), r.original_query, r.optimized_query,
+                        r.original_avg_ms, r.optimized_avg_ms, r.improvement_pct,
+                        r.improvement_ms, r.confidence, r.optimization_type,
+                        r.success, r.error_message
+                    )
+                    for r in results
+                ]
+                async with pool.acquire() as conn:
+                    await conn.copy_records_to_table(
+                        "performance_improvements",
+                        records=records,
+                        columns=[
+                            "query_id", "original_query", "optimized_query",
+                            "original_avg_ms", "optimized_avg_ms", "improvement_pct",
+                            "improvement_ms", "confidence", "optimization_type",
+                            "success", "error_message"
+                        ]
+                    )
+            else:
+                insert_query = text("""
+                    INSERT INTO performance_improvements (
+                        query_id, original_query, optimized_query, original_avg_ms,
+                        optimized_avg_ms, improvement_pct, improvement_ms, confidence,
+                        optimization_type, success, error_message
+                    ) VALUES (
+                        :query_id, :original_query, :optimized_query, :original_avg_ms,
+                        :optimized_avg_ms, :improvement_pct, :improvement_ms, :confidence,
+                        :optimization_type, :success, :error_message
+                    )
+                """)
+                await session.execute(insert_query, [
+                    {
+                        "query_id": r.query_id,
+                        "original_query": r.original_query,
+                        "optimized_query": r.optimized_query,
+                        "original_avg_ms": r.original_avg_ms,
+                        "optimized_avg_ms": r.optimized_avg_ms,
+                        "improvement_pct": r.improvement_pct,
+                        "improvement_ms": r.improvement_ms,
+                        "confidence": r.confidence,
+                        "optimization_type": r.optimization_type,
+                        "success": r.success,
+                        "error_message": r.error_message
+                    }
+                    for r in results
+                ])
+                await session.commit()
+
+            # One invalidation for the whole batch
+            from app.core.cache import stats_cache
+            stats_cache.invalidate("benchmark:")
+            stats_cache.invalidate("stats:")
+
+            logger.info(f"Stored {len(results)} benchmark results in bulk")
+
+        except Exception as e:
+            logger.error(f"Failed to store benchmark results in bulk: {e}")
+            await session.rollback()
+
     async def get_benchmark_summary(self, session: AsyncSession) -> Dict[str, Any]:
         """Get summary statistics of all benchmark results."""
         try:
@@ -277,7 +659,8 @@ class BenchmarkEngine:
                     AVG(improvement_pct) FILTER (WHERE success = true) as avg_improvement_pct,
                     SUM(improvement_ms) FILTER (WHERE success = true) as total_time_saved_ms,
                     MAX(improvement_pct) FILTER (WHERE success = true) as max_improvement_pct,
-                    AVG(confidence) FILTER (WHERE success = true) as avg_confidence
+                    AVG(confidence) FILTER (WHERE success = true) as avg_confidence,
+                    MAX(created_at) as last_benchmark_at
                 FROM performance_improvements
             """)
             
@@ -293,7 +676,8 @@ class BenchmarkEngine:
                     "total_time_saved_seconds": round((row[3] or 0) / 1000, 2),
                     "max_improvement_pct": round(row[4] or 0, 2),
                     "avg_confidence": round(row[5] or 0, 3),
-                    "success_rate_pct": round(((row[1] or 0) / max(row[0], 1)) * 100, 2)
+                    "success_rate_pct": round(((row[1] or 0) / max(row[0], 1)) * 100, 2),
+                    "last_benchmark_at": row[6].isoformat() if row[6] else None
                 }
             
             return {}
@@ -304,4 +688,4 @@ class BenchmarkEngine:
 
 
 # Global instance
-benchmark_engine = BenchmarkEngine(settings.database_url)
\ No newline at end of file
+benchmark_engine = BenchmarkEngine(settings.database_dsn)
\ No newline at end of file
@@ -1,7 +1,10 @@
 import re
+import time
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Dict, Any, List, Optional, Set, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
+from sqlalchemy import bindparam, inspect, select, text
 
 import sqlglot
 from sqlglot import exp, parse_one
@@ -13,39 +16,163 @@ from app.services.plan_parser import plan_parser
 from app.core.logger import logger
 from app.core.config import settings
 
+try:
+    # Prefer the DFA-based RE2 engine when installed: linear-time matching
+    # with no backtracking, same API for the patterns used here
+    import re2 as _regex
+except ImportError:
+    _regex = re
+
+try:
+    # Optional C extension: one automaton pass reports every keyword hit
+    # instead of one substring scan per keyword
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Keywords surfaced as boolean features from the uppercased query text
+_KEYWORDS = ("ORDER BY", "GROUP BY", "HAVING", "LIMIT", "DISTINCT", "UNION")
+
+if ahocorasick is not None:
+    _KW_AUTOMATON = ahocorasick.Automaton()
+    for _kw in _KEYWORDS:
+        _KW_AUTOMATON.add_word(_kw, _kw)
+    _KW_AUTOMATON.make_automaton()
+else:
+    _KW_AUTOMATON = None
+
+
+def _keyword_hits(upper_text: str) -> Set[str]:
+    """Return the subset of _KEYWORDS present in the uppercased text."""
+    if _KW_AUTOMATON is not None:
+        return {kw for _, kw in _KW_AUTOMATON.iter(upper_text)}
+    return {kw for kw in _KEYWORDS if kw in upper_text}
+
+
+# Statements with nothing to featurize: transaction control, session
+# settings, and similar. pg_stat_statements workloads are full of these
+# and none of them deserve a sqlglot parse.
+_TRIVIAL_STMT_RE = re.compile(
+    r'^\s*(?:BEGIN|COMMIT|ROLLBACK|SET|SHOW|RESET|DISCARD|DEALLOCATE)\b', re.IGNORECASE
+)
+
+_ZERO_FEATURES = {
+    "num_joins": 0,
+    "has_select_star": False,
+    "has_where_clause": False,
+    "num_subqueries": 0,
+    "query_length": 0,
+    "num_tables": 0,
+    "has_order_by": False,
+    "has_group_by": False,
+    "has_having": False,
+    "has_limit": False,
+    "has_distinct": False,
+    "has_aggregate": False,
+    "complexity_score": 0.0,
+}
+
+# Semi-join constructs weighted by the complexity score; compiled once
+# at import since it runs on every scored query
+_EXISTS_IN_RE = _regex.compile(r'\bEXISTS\b|\bIN\s*\(', re.IGNORECASE)
+
+# Combined fallback scanner: when sqlglot cannot parse a query, a single
+# finditer pass over the text populates every structural feature instead
+# of one scan per feature. Compiled with stdlib re on purpose: the
+# subquery branch needs a lookahead, which RE2's DFA cannot express.
+_FALLBACK_SCAN_RE = re.compile(
+    r'(?P<subquery>\(\s*(?=SELECT\b))'
+    r'|(?P<star>\bSELECT\s*\*)'
+    r'|(?P<where>\bWHERE\b)'
+    r'|(?P<join>\bJOIN\b(?:\s+(?P<jtable>[a-zA-Z_][\w\.]*))?)'
+    r'|(?P<from>\bFROM\s+(?P<ftable>[a-zA-Z_][\w\.]*))'
+    r'|(?P<agg>\b(?:COUNT|SUM|AVG|MAX|MIN)\s*\()',
+    re.IGNORECASE,
+)
+
+
+@dataclass(slots=True)
+class _QCtx:
+    """Per-extraction context: the query text, its one uppercase copy,
+    and the parsed tree (None when sqlglot could not parse).
+
+    Query text can be tens of KB, so .upper() is paid exactly once here
+    and shared by every keyword check and the complexity score.
+    """
+    text: str
+    upper: str
+    tree: Optional[exp.Expression]
+
+
+@lru_cache(maxsize=4096)
+def _parse_sql_cached(query_text: str) -> Optional[exp.Expression]:
+    """Parse SQL once per distinct text; unparseable queries cache None."""
+    try:
+        # parse_one handles single statements; use read='postgres' for dialect awareness
+        return parse_one(query_text, read="postgres")
+    except Exception as e:
+        logger.debug("sqlglot failed to parse SQL: %s. Falling back to regex heuristics.", e)
+        return None
+
 
 class FeatureExtractor:
     """Service for extracting features from SQL queries and execution plans."""
 
+    def __init__(self):
+        # Catalog facts change slowly; cache (size_bytes, has_index) per
+        # (schema, table) for a few minutes so hot tables stop hitting
+        # pg_class on every feature extraction. Same TTL pattern as the
+        # benchmark engine's schema cache.
+        self._catalog_cache: Dict[Tuple[str, str], Tuple[Tuple[float, bool], float]] = {}
+        self._catalog_ttl = 300.0
+
     def extract_query_features(self, query_text: str) -> Dict[str, Any]:
         """
         Extract features from SQL query text using SQL AST when possible,
         falling back to regex heuristics if parsing fails.
         """
-        tree = self._try_parse_sql(query_text)
+        upper_text = query_text.upper()
+
+        # Cheap prefilter: transaction control / session statements and
+        # anything with no query keywords at all get the zero vector
+        # without paying for a parse
+        if _TRIVIAL_STMT_RE.match(query_text) or not any(
+            kw in upper_text for kw in ("SELECT", "INSERT", "UPDATE", "DELETE")
+        ):
+            features = dict(_ZERO_FEATURES)
+            features["query_length"] = len(query_text)
+            return features
+
+        ctx = _QCtx(
+            text=query_text,
+            upper=upper_text,
+            tree=self._try_parse_sql(query_text),
+        )
 
-        num_joins = self._count_joins_ast(query_text, tree)
-        has_select_star = self._has_select_star_ast(query_text, tree)
-        has_where_clause = self._has_where_clause_ast(query_text, tree)
-        num_subqueries = self._count_subqueries_ast(tree, query_text)
-        num_tables = self._count_tables_ast(tree, query_text)
-        has_aggregate = self._has_aggregate_functions_ast(tree, query_text)
+        if ctx.tree is not None:
+            (num_joins, has_select_star, has_where_clause,
+             num_subqueries, num_tables, has_aggregate) = self._collect_ast_stats(ctx.tree)
+        else:
+            (num_joins, has_select_star, has_where_clause,
+             num_subqueries, num_tables, has_aggregate) = self._scan_features_fallback(ctx.text)
+
+        keyword_hits = _keyword_hits(ctx.upper)
 
         features = {
             "num_joins": num_joins,
             "has_select_star": has_select_star,
             "has_where_clause": has_where_clause,
             "num_subqueries": num_subqueries,
-            "query_length": len(query_text),
+            "query_length": len(ctx.text),
             "num_tables": num_tables,
-            "has_order_by": "ORDER BY" in query_text.upper(),
-            "has_group_by": "GROUP BY" in query_text.upper(),
-            "has_having": "HAVING" in query_text.upper(),
-            "has_limit": "LIMIT" in query_text.upper(),
-            "has_distinct": "DISTINCT" in query_text.upper(),
+            "has_order_by": "ORDER BY" in keyword_hits,
+            "has_group_by": "GROUP BY" in keyword_hits,
+            "has_having": "HAVING" in keyword_hits,
+            "has_limit": "LIMIT" in keyword_hits,
+            "has_distinct": "DISTINCT" in keyword_hits,
             "has_aggregate": has_aggregate,
-            "complexity_score": self._calculate_complexity_score_with_ast(
-                query_text, num_joins, num_subqueries, has_aggregate
+            "complexity_score": self._calculate_complexity_score(
+                ctx, num_joins, num_subqueries, has_aggregate, keyword_hits
             ),
         }
 
@@ -86,15 +213,31 @@ class FeatureExtractor:
         # Plan features if available
         plan_features: Dict[str, Any] = {}
         if execution_plan:
-            plan_node = plan_parser.parse_plan_json(execution_plan.plan_json)
-            plan_analysis = plan_parser.analyze_plan(plan_node)
+            # plan_json is a deferred column; touching it unloaded on a
+            # persistent row would trigger a sync lazy load under the
+            # AsyncSession, so fetch it explicitly in that case
+            state = inspect(execution_plan)
+            if state.persistent and "plan_json" in state.unloaded:
+                plan_json = await session.scalar(
+                    select(ExecutionPlan.plan_json)
+                    .where(ExecutionPlan.id == execution_plan.id)
+                )
+            else:
+                plan_json = execution_plan.plan_json
+            # analyze_raw walks the EXPLAIN dicts directly, skipping the
+            # intermediate PlanNode tree we would throw away anyway
+            plan_analysis = plan_parser.analyze_raw(plan_json)
             plan_features = self.extract_plan_features(plan_analysis)
 
         is_slow_query = query_log.mean_exec_time > settings.slow_query_threshold_ms
 
-        # Async DB-driven metrics (if plan_features has tables_scanned)
-        indexed_tables_pct = await self._calculate_indexed_tables_pct(session, plan_features)
-        avg_table_size_mb = await self._estimate_table_size(session, plan_features)
+        # Async DB-driven metrics (if plan_features has tables_scanned).
+        # One combined catalog query: an asyncio.gather over the two
+        # lookups is not an option on a single AsyncSession, so the wait
+        # is removed by merging the round-trips instead of overlapping them
+        indexed_tables_pct, avg_table_size_mb = await self._table_catalog_stats(
+            session, plan_features
+        )
 
         feature = QueryFeature(
             query_id=query_log.id,
@@ -113,6 +256,41 @@ class FeatureExtractor:
         await session.commit()
         return feature
 
+    def _scan_features_fallback(
+        self, query_text: str
+    ) -> Tuple[int, bool, bool, int, int, bool]:
+        """
+        Populate every structural feature in one linear pass over the
+        text. Used when sqlglot fails to parse; returns the tuple
+        (num_joins, has_select_star, has_where_clause, num_subqueries,
+        num_tables, has_aggregate).
+        """
+        num_joins = 0
+        num_subqueries = 0
+        has_select_star = False
+        has_where_clause = False
+        has_aggregate = False
+        tables: Set[str] = set()
+
+        for m in _FALLBACK_SCAN_RE.finditer(query_text):
+            if m.group("join"):
+                num_joins += 1
+                if m.group("jtable"):
+                    tables.add(m.group("jtable"))
+            elif m.group("subquery"):
+                num_subqueries += 1
+            elif m.group("star"):
+                has_select_star = True
+            elif m.group("where"):
+                has_where_clause = True
+            elif m.group("from"):
+                tables.add(m.group("ftable"))
+            elif m.group("agg"):
+                has_aggregate = True
+
+        return (num_joins, has_select_star, has_where_clause,
+                num_subqueries, len(tables), has_aggregate)
+
     # -----------------------
     # AST parsing utilities
     # -----------------------
@@ -120,214 +298,195 @@ class FeatureExtractor:
         """
         Try to parse SQL into an AST using sqlglot. Return the root expression or None.
         We prefer the 'postgres' dialect but fall back to default parse on failure.
+
+        Parses are memoized per query text: the recursive-descent parse
+        is the dominant pure-Python cost here and the same SQL recurs
+        constantly (retries, dashboards, re-featurization). The cached
+        tree is shared, which is safe because every extractor below only
+        reads it via find_all/walk — callers must not mutate it.
         """
-        try:
-            # parse_one handles single statements; use read='postgres' for dialect awareness
-            return parse_one(query_text, read="postgres")
-        except Exception as e:
-            logger.debug("sqlglot failed to parse SQL: %s. Falling back to regex heuristics.", e)
-            return None
+        return _parse_sql_cached(query_text.strip())
 
     # -----------------------
-    # AST-based feature extractors with regex fallback
+    # AST-based feature extraction
     # -----------------------
-    def _count_joins_ast(self, query_text: str, tree: Optional[exp.Expression]) -> int:
-        if tree:
-            # Count explicit JOIN expressions
-            return sum(1 for _ in tree.find_all(exp.Join))
-        # fall back to regex count
-        join_pattern = r'\b(?:INNER|LEFT|RIGHT|FULL|CROSS)?\s*JOIN\b'
-        return len(re.findall(join_pattern, query_text.upper()))
-
-    def _has_select_star_ast(self, query_text: str, tree: Optional[exp.Expression]) -> bool:
-        if tree:
-            for star in tree.find_all(exp.Star):
-                # ensure the star is part of a SELECT projection
-                if any(node for node in star.walk() if isinstance(node, exp.Select)):
-                    return True
-            # simpler approach: look for Select with Star columns
-            for select in tree.find_all(exp.Select):
-                for proj in select.expressions:
-                    if isinstance(proj, exp.Star):
-                        return True
-            return False
-        # fallback regex
-        return bool(re.search(r'SELECT\s*\*', query_text, flags=re.IGNORECASE))
-
-    def _has_where_clause_ast(self, query_text: str, tree: Optional[exp.Expression]) -> bool:
-        if tree:
-            return any(True for _ in tree.find_all(exp.Where))
-        return bool(re.search(r'\bWHERE\b', query_text, flags=re.IGNORECASE))
-
-    def _count_subqueries_ast(self, tree: Optional[exp.Expression], query_text: str) -> int:
-        """
-        Count subqueries:
-        - Prefer counting `Subquery` nodes and nested `Select` nodes.
-        - If parse fails, fallback to a regex counting pattern like '(SELECT ...)'.
-        """
-        if tree:
-            # Count explicit Subquery nodes
-            subquery_count = sum(1 for _ in tree.find_all(exp.Subquery))
-            # Count nested Select nodes (exclude top-level main select)
-            select_count = sum(1 for _ in tree.find_all(exp.Select))
-            if select_count > 0:
-                nested_selects = max(0, select_count - 1)
-                subquery_count = max(subquery_count, nested_selects)
-            return subquery_count
-
-        # fallback regex: detects SELECT within parentheses
-        return len(re.findall(r'\(\s*SELECT\b', query_text, flags=re.IGNORECASE))
-
-    def _count_tables_ast(self, tree: Optional[exp.Expression], query_text: str) -> int:
+    _AGGREGATE_NAMES = frozenset({"COUNT", "SUM", "AVG", "MAX", "MIN"})
+
+    def _collect_ast_stats(
+        self, tree: exp.Expression
+    ) -> Tuple[int, bool, bool, int, int, bool]:
         """
-        Return number of unique referenced tables (schema-qualified preserved as 'schema.table').
-        Use AST to detect Table nodes; fallback to regex extraction of FROM/JOIN tokens.
+        Classify every node of a parsed query in one walk and return the
+        tuple (num_joins, has_select_star, has_where_clause,
+        num_subqueries, num_tables, has_aggregate). The previous
+        per-feature find_all helpers each re-traversed the whole tree.
         """
-        tables: Set[str] = set()
-        if tree:
-            for table in tree.find_all(exp.Table):
-                try:
-                    # sqlglot Table node may have .this or .name; sql() produces proper SQL snippet
-                    sql_name = table.sql(dialect="postgres")
-                    # normalize by removing extra quoting and whitespace
-                    tables.add(sql_name.strip())
-                except Exception:
-                    # best effort: try attributes
-                    if table.this:
-                        tables.add(str(table.this))
-            return len(tables)
-
-        # fallback regex: capture simple identifiers (schema.table or table)
-        from_pattern = r'FROM\s+([a-zA-Z_][\w\.]*)'
-        join_pattern = r'JOIN\s+([a-zA-Z_][\w\.]*)'
-        from_tables = re.findall(from_pattern, query_text, flags=re.IGNORECASE)
-        join_tables = re.findall(join_pattern, query_text, flags=re.IGNORECASE)
-        all_tables = set(from_tables + join_tables)
-        return len(all_tables)
-
-    def _has_aggregate_functions_ast(self, tree: Optional[exp.Expression], query_text: str) -> bool:
-        if tree:
-            # count occurrences of aggregate-like function nodes
-            aggregates = {"COUNT", "SUM", "AVG", "MAX", "MIN"}
-            for func in tree.find_all(exp.Anonymous):
-                name = getattr(func, "name", None)
-                if name and name.upper() in aggregates:
-                    return True
-            # sqlglot also models many built-ins as function expressions
-            for func in tree.find_all(exp.Func):
-                name = getattr(func, "this", None)
-                # func.this may be an Identifier
-                try:
-                    fname = func.name.upper()
-                except Exception:
-                    fname = None
-                if fname and fname in aggregates:
-                    return True
-            return False
-        # fallback regex
-        aggregate_patterns = [r'\bCOUNT\b', r'\bSUM\b', r'\bAVG\b', r'\bMAX\b', r'\bMIN\b']
-        for pattern in aggregate_patterns:
-            if re.search(pattern, query_text, flags=re.IGNORECASE):
-                return True
-        return False
-
-    def _calculate_complexity_score_with_ast(
-        self, query_text: str, num_joins: int, num_subqueries: int, has_aggregate: bool
+        num_joins = 0
+        num_selects = 0
+        num_subqueries = 0
+        has_select_star = False
+        has_where_clause = False
+        has_aggregate = False
+        tables: Set[Tuple[str, str]] = set()
+
+        for node in tree.walk():
+            if isinstance(node, exp.Join):
+                num_joins += 1
+            elif isinstance(node, exp.Select):
+                num_selects += 1
+                if not has_select_star:
+                    has_select_star = any(
+                        isinstance(proj, exp.Star) for proj in node.expressions
+                    )
+            elif isinstance(node, exp.Subquery):
+                num_subqueries += 1
+            elif isinstance(node, exp.Where):
+                has_where_clause = True
+            elif isinstance(node, exp.Table):
+                # (db, name) straight off the parsed node; .sql() would
+                # re-run the SQL generator once per table reference
+                tables.add((node.db or "", node.name))
+            elif isinstance(node, exp.AggFunc):
+                # sqlglot models builtin aggregates (AVG, SUM, ...) as
+                # typed AggFunc subclasses; name-based matching missed them
+                has_aggregate = True
+            elif isinstance(node, exp.Anonymous):
+                # unknown functions parse as Anonymous; check those by name
+                name = getattr(node, "name", None)
+                if name and name.upper() in self._AGGREGATE_NAMES:
+                    has_aggregate = True
+
+        # Nested SELECTs (set operations, derived tables) count as
+        # subqueries even when not wrapped in an explicit Subquery node
+        num_subqueries = max(num_subqueries, max(0, num_selects - 1))
+
+        return (num_joins, has_select_star, has_where_clause,
+                num_subqueries, len(tables), has_aggregate)
+
+    def _calculate_complexity_score(
+        self,
+        ctx: _QCtx,
+        num_joins: int,
+        num_subqueries: int,
+        has_aggregate: bool,
+        keyword_hits: Set[str]
     ) -> float:
         """
         Improved complexity score that uses AST-derived counts when available.
         Score between 0.0 and 1.0.
         """
         score = 0.0
-        score += min(len(query_text) / 1000.0, 1.0)
+        score += min(len(ctx.text) / 1000.0, 1.0)
         score += min(num_joins * 0.15, 0.4)         # each join adds weight
         score += min(num_subqueries * 0.25, 0.5)    # subqueries are costly
         if has_aggregate:
             score += 0.08
-        if "UNION" in query_text.upper():
+        if "UNION" in keyword_hits:
             score += 0.12
-        if re.search(r'\bEXISTS\b|\bIN\s*\(', query_text, flags=re.IGNORECASE):
+        if _EXISTS_IN_RE.search(ctx.text):
             score += 0.08
         return min(score, 1.0)
 
     # -----------------------
     # Postgres-backed async utilities
     # -----------------------
-    async def _calculate_indexed_tables_pct(self, session: AsyncSession, plan_features: Dict[str, Any]) -> float:
-        """
-        Check pg_indexes for each scanned table and return % that have at least one index.
-        plan_features['tables_scanned'] expected to be list like ['public.orders', 'schema.table'].
-        """
-        tables: List[str] = plan_features.get("tables_scanned", [])
-        if not tables:
-            return 0.0
-
-        indexed_count = 0
-        checked = 0
+    @staticmethod
+    def _normalize_table_pairs(tables: List[str]) -> List[Tuple[str, str]]:
+        """Split 'schema.table' names into unique (schema, table) pairs."""
+        pairs = set()
         for t in tables:
-            # Normalize schema & table
             if "." in t:
                 schema, table_name = t.split(".", 1)
             else:
                 schema, table_name = "public", t
-            checked += 1
-            try:
-                q = text(
-                    "SELECT COUNT(*) FROM pg_indexes WHERE schemaname = :schema AND tablename = :table_name"
-                )
-                res = await session.execute(q, {"schema": schema, "table_name": table_name})
-                count = res.scalar() or 0
-                if count > 0:
-                    indexed_count += 1
-            except Exception as e:
-                logger.debug("Error when checking indexes for %s.%s: %s", schema, table_name, e)
-                # ignore and continue
-
-        if checked == 0:
-            return 0.0
-        return (indexed_count / checked) * 100.0
+            pairs.add((schema, table_name))
+        return sorted(pairs)
 
-    async def _estimate_table_size(self, session: AsyncSession, plan_features: Dict[str, Any]) -> float:
+    async def _table_catalog_stats(
+        self, session: AsyncSession, plan_features: Dict[str, Any]
+    ) -> Tuple[float, float]:
         """
-        Query pg_total_relation_size for each scanned table and return average size in MB.
-        Uses pg_catalog.pg_tables to ensure table exists and quote identifiers.
+        Return (indexed_tables_pct, avg_table_size_mb) for the scanned tables.
+        plan_features['tables_scanned'] expected to be list like ['public.orders', 'schema.table'].
+
+        Index presence and relation size come from one tuple-IN query
+        over pg_class/pg_namespace, so N tables cost a single round-trip
+        rather than per-table (or even per-metric) queries.
         """
         tables: List[str] = plan_features.get("tables_scanned", [])
         if not tables:
-            return 0.0
+            return 0.0, 0.0
 
-        total_mb = 0.0
-        counted = 0
-        for t in tables:
-            if "." in t:
-                schema, table_name = t.split(".", 1)
+        pairs = self._normalize_table_pairs(tables)
+        now = time.monotonic()
+        stats: Dict[Tuple[str, str], Tuple[float, bool]] = {}
+
+        misses = []
+        for pair in pairs:
+            cached = self._catalog_cache.get(pair)
+            if cached is not None and now - cached[1] < self._catalog_ttl:
+                stats[pair] = cached[0]
             else:
-                schema, table_name = "public", t
+                misses.append(pair)
 
-            # Use format: pg_total_relation_size('schemaname.tablename') but prefer safe quoting via pg_namespace/pg_class lookup:
+        if misses:
             try:
-                # Find relid via pg_class/join with pg_namespace to avoid quoting issues
-                relid_q = text(
+                q = text(
                     """
-                    SELECT pg_total_relation_size(c.oid)
+                    SELECT n.nspname, c.relname,
+                           pg_total_relation_size(c.oid) AS size_bytes,
+                           EXISTS (
+                               SELECT 1 FROM pg_index i WHERE i.indrelid = c.oid
+                           ) AS has_index
                     FROM pg_class c
                     JOIN pg_namespace n ON n.oid = c.relnamespace
-                    WHERE n.nspname = :schema AND c.relname = :table_name
+                    WHERE (n.nspname, c.relname) IN :pairs
                     """
-                )
-                res = await session.execute(relid_q, {"schema": schema, "table_name": table_name})
-                size_bytes = res.scalar() or 0
-                size_mb = float(size_bytes) / (1024.0 * 1024.0)
-                total_mb += size_mb
-                counted += 1
+                ).bindparams(bindparam("pairs", expanding=True))
+                res = await session.execute(q, {"pairs": misses})
+                for row in res:
+                    entry = (float(row.size_bytes), bool(row.has_index))
+                    stats[(row.nspname, row.relname)] = entry
+                    self._catalog_cache[(row.nspname, row.relname)] = (entry, now)
             except Exception as e:
-                logger.debug("Failed to fetch size for %s.%s: %s", schema, table_name, e)
-                # ignore and continue
+                logger.debug("Error fetching catalog stats for %s: %s", misses, e)
+
+        if not stats:
+            return 0.0, 0.0
 
-        if counted == 0:
-            return 0.0
-        return total_mb / counted
+        indexed_pct = (sum(1 for _, has_index in stats.values() if has_index) / len(pairs)) * 100.0
+        avg_size_mb = (sum(size for size, _ in stats.values()) / len(stats)) / (1024.0 * 1024.0)
+        return indexed_pct, avg_size_mb
+
+    def invalidate_catalog_cache(self, schema: str = None, table: str = None) -> None:
+        """Drop cached catalog stats, e.g. after DDL.
+
+        With no arguments the whole cache is cleared; with both, only
+        that table's entry.
+        """
+        if schema is None or table is None:
+            self._catalog_cache.clear()
+        else:
+            self._catalog_cache.pop((schema, table), None)
 
 
 # Global instance
 feature_extractor = FeatureExtractor()
+
+
+@lru_cache(maxsize=4096)
+def _cached_query_features(query_text: str) -> Tuple[Tuple[str, Any], ...]:
+    """Memoized extraction; stored as a tuple so cached entries are immutable."""
+    return tuple(feature_extractor.extract_query_features(query_text).items())
+
+
+def extract_query_features_cached(query_text: str) -> Dict[str, Any]:
+    """
+    Extract query features with a bounded LRU cache.
+
+    Feature extraction is pure and deterministic per query text, so
+    repeated queries (the common case for pg_stat_statements workloads)
+    skip the parse entirely. Returns a fresh dict each call so callers
+    cannot corrupt the cached entry.
+    """
+    return dict(_cached_query_features(query_text))
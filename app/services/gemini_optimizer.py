@@ -1,7 +1,10 @@
 import google.generativeai as genai
 from typing import Dict, Any, List, Optional, Tuple
-import json
-import re
+import asyncio
+import hashlib
+import orjson
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime
 
@@ -11,6 +14,42 @@ from app.core.logger import logger
 from app.core.config import settings
 
 
+def _extract_json_span(text: str, opener: str = "{") -> Optional[str]:
+    """Return the first balanced JSON object (or array) in ``text``.
+
+    Linear single-pass scan tracking bracket depth and string/escape
+    state, instead of a greedy DOTALL regex over the whole response —
+    no backtracking hazard on odd model output and no over-matching
+    when the response contains several JSON fragments.
+    """
+    closer = "}" if opener == "{" else "]"
+    start = text.find(opener)
+    if start == -1:
+        return None
+
+    depth = 0
+    in_string = False
+    escape = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == opener:
+            depth += 1
+        elif ch == closer:
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+
 @dataclass
 class OptimizationResult:
     """Result of query optimization attempt."""
@@ -22,13 +61,114 @@ class OptimizationResult:
     estimated_improvement: float
 
 
+class _OptimizationBatcher:
+    """Coalesces concurrent optimize_query calls into multi-query prompts.
+
+    Mirrors the ML engine's BatchPredictor: requests queue for a few
+    milliseconds, one prompt carries up to max_batch queries, and the
+    JSON array response is scattered back to the awaiting callers via
+    futures. N simultaneous optimizations cost ceil(N/max_batch) HTTPS
+    round-trips instead of N.
+    """
+
+    def __init__(self, optimizer: "GeminiQueryOptimizer",
+                 max_batch: int = 8, max_latency_ms: float = 50.0):
+        self.optimizer = optimizer
+        self.max_batch = max_batch
+        self.max_latency_s = max_latency_ms / 1000.0
+        self._queue: Optional[asyncio.Queue] = None
+        self._consumer: Optional[asyncio.Task] = None
+
+    async def submit(self, query: str, suggestions, table_schemas) -> "OptimizationResult":
+        """Enqueue one optimization request and await its result."""
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._consumer = asyncio.create_task(self._consume())
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(((query, suggestions, table_schemas), future))
+        return await future
+
+    async def _consume(self):
+        """Drain the queue into batches and run one prompt per batch."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_latency_s
+
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                results = await self.optimizer._optimize_batch([args for args, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+
 class GeminiQueryOptimizer:
     """AI-powered query optimizer using Google Gemini."""
     
+    # Identical inputs recur constantly under real workloads (dashboard
+    # refreshes, idempotent re-analysis); re-asking Gemini for them
+    # wastes hundreds of ms and API quota. Entries expire after an hour
+    # so a changed model response eventually propagates.
+    _CACHE_MAX = 2048
+    _CACHE_TTL = 3600.0
+
     def __init__(self, api_key: str):
         genai.configure(api_key=api_key)
         self.model = genai.GenerativeModel('gemini-pro')
-        
+        self._result_cache: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._batcher = _OptimizationBatcher(self)
+
+    @staticmethod
+    def _cache_key(query: str, suggestions: List[Suggestion] = None,
+                   table_schemas: Dict[str, List[str]] = None) -> str:
+        """Digest of whitespace-normalized SQL plus the suggestion types
+        and schemas that shape the prompt — different context means a
+        different prompt, so it must not share a cache entry."""
+        h = hashlib.blake2b(digest_size=16)
+        h.update(" ".join(query.split()).encode())
+        if suggestions:
+            h.update("|".join(sorted({s.suggestion_type for s in suggestions})).encode())
+        if table_schemas:
+            h.update(repr(sorted((t, tuple(c)) for t, c in table_schemas.items())).encode())
+        return h.hexdigest()
+
+    def _cache_get(self, key: str):
+        entry = self._result_cache.get(key)
+        if entry is None:
+            return None
+        value, ts = entry
+        if time.monotonic() - ts >= self._CACHE_TTL:
+            del self._result_cache[key]
+            return None
+        self._result_cache.move_to_end(key)
+        return value
+
+    def _cache_put(self, key: str, value) -> None:
+        self._result_cache[key] = (value, time.monotonic())
+        if len(self._result_cache) > self._CACHE_MAX:
+            self._result_cache.popitem(last=False)
+
+    def cache_clear(self) -> None:
+        """Drop all cached Gemini responses."""
+        self._result_cache.clear()
+
+
     async def optimize_query(
         self, 
         query: str, 
@@ -47,14 +187,23 @@ class GeminiQueryOptimizer:
             OptimizationResult with optimized query and metadata
         """
         try:
-            prompt = self._build_optimization_prompt(query, suggestions, table_schemas)
-            
-            response = self.model.generate_content(prompt)
-            result = self._parse_gemini_response(response.text, query)
-            
+            key = self._cache_key(query, suggestions, table_schemas)
+            cached = self._cache_get(key)
+            if cached is not None:
+                logger.debug("Gemini optimization served from cache")
+                return cached
+
+            # Concurrent requests coalesce into one multi-query prompt
+            result = await self._batcher.submit(query, suggestions, table_schemas)
+
+            # Only successful rewrites are worth remembering; failures
+            # should be retried on the next request
+            if result.optimization_type not in ("FAILED", "PARSE_ERROR"):
+                self._cache_put(key, result)
+
             logger.info(f"Gemini optimization completed with {result.confidence:.2f} confidence")
             return result
-            
+
         except Exception as e:
             logger.error(f"Gemini optimization failed: {e}")
             return OptimizationResult(
@@ -66,6 +215,113 @@ class GeminiQueryOptimizer:
                 estimated_improvement=0.0
             )
     
+    async def _optimize_single(
+        self,
+        query: str,
+        suggestions: List[Suggestion],
+        table_schemas: Dict[str, List[str]] = None
+    ) -> OptimizationResult:
+        """Run one optimization prompt; returns a FAILED result on error."""
+        try:
+            prompt = self._build_optimization_prompt(query, suggestions, table_schemas)
+            response = await self.model.generate_content_async(prompt)
+            return self._parse_gemini_response(response.text, query)
+        except Exception as e:
+            logger.error(f"Gemini optimization failed: {e}")
+            return OptimizationResult(
+                original_query=query,
+                optimized_query=query,
+                optimization_type="FAILED",
+                confidence=0.0,
+                explanation=f"Optimization failed: {str(e)}",
+                estimated_improvement=0.0
+            )
+
+    async def _optimize_batch(self, items: List[Tuple]) -> List[OptimizationResult]:
+        """Optimize a coalesced batch of (query, suggestions, schemas).
+
+        A single item goes through the normal single prompt; larger
+        batches share one multi-query prompt, falling back to
+        sequential single calls if the batched response cannot be
+        parsed or does not line up with the inputs.
+        """
+        if len(items) == 1:
+            query, suggestions, table_schemas = items[0]
+            return [await self._optimize_single(query, suggestions, table_schemas)]
+
+        try:
+            prompt = self._build_batch_prompt(items)
+            response = await self.model.generate_content_async(prompt)
+            results = self._parse_batch_response(response.text, items)
+            if results is not None:
+                return results
+        except Exception as e:
+            logger.warning(f"Batched Gemini optimization failed, retrying singly: {e}")
+
+        return [
+            await self._optimize_single(query, suggestions, table_schemas)
+            for query, suggestions, table_schemas in items
+        ]
+
+    def _build_batch_prompt(self, items: List[Tuple]) -> str:
+        """Compose one prompt covering every query in the batch."""
+        sections = []
+        for i, (query, suggestions, table_schemas) in enumerate(items):
+            suggestion_text = "\n".join(
+                f"- {s.suggestion_type}: {s.message}" for s in suggestions
+            )
+            schema_text = ""
+            if table_schemas:
+                schema_text = "Table Schemas:\n" + "".join(
+                    f"- {table}: {', '.join(columns)}\n"
+                    for table, columns in table_schemas.items()
+                )
+            sections.append(
+                f"QUERY {i}:\n```sql\n{query}\n```\n"
+                f"OPTIMIZATION SUGGESTIONS:\n{suggestion_text}\n{schema_text}"
+            )
+
+        joined = "\n\n".join(sections)
+        return f"""
+You are a PostgreSQL query optimization expert. Optimize each of the following {len(items)} SQL queries based on its suggestions. Ensure every optimized query produces the same result set as its original.
+
+{joined}
+
+RESPONSE FORMAT: a JSON array containing exactly {len(items)} objects, in the same order as the queries above, each shaped as:
+{{
+    "optimized_query": "-- Your optimized SQL query here",
+    "optimization_type": "COMPREHENSIVE|INDEX|QUERY_REWRITE|JOIN_OPTIMIZATION",
+    "confidence": 0.85,
+    "explanation": "Detailed explanation of changes made",
+    "estimated_improvement_pct": 35
+}}
+
+Provide only the JSON array, no additional text.
+"""
+
+    def _parse_batch_response(
+        self, response_text: str, items: List[Tuple]
+    ) -> Optional[List[OptimizationResult]]:
+        """Map a batched JSON array response back onto the batch inputs.
+
+        Returns None when the response is missing, malformed, or does
+        not contain one object per query, so the caller can retry singly.
+        """
+        try:
+            span = _extract_json_span(response_text, opener="[")
+            if span is None:
+                return None
+            payload = orjson.loads(span)
+            if not isinstance(payload, list) or len(payload) != len(items):
+                return None
+            return [
+                self._result_from_dict(entry, query)
+                for entry, (query, _, _) in zip(payload, items)
+            ]
+        except Exception as e:
+            logger.debug("Could not parse batched Gemini response: %s", e)
+            return None
+
     def _build_optimization_prompt(
         self, 
         query: str, 
@@ -136,21 +392,14 @@ Provide only the JSON response, no additional text.
         """Parse Gemini's JSON response into OptimizationResult."""
         try:
             # Clean the response text and extract JSON
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if not json_match:
+            span = _extract_json_span(response_text)
+            if span is None:
                 raise ValueError("No JSON found in response")
-            
-            result = json.loads(json_match.group())
-            
-            return OptimizationResult(
-                original_query=original_query,
-                optimized_query=result.get('optimized_query', original_query),
-                optimization_type=result.get('optimization_type', 'UNKNOWN'),
-                confidence=float(result.get('confidence', 0.5)),
-                explanation=result.get('explanation', 'No explanation provided'),
-                estimated_improvement=float(result.get('estimated_improvement_pct', 0))
-            )
-            
+
+            result = orjson.loads(span)
+
+            return self._result_from_dict(result, original_query)
+
         except Exception as e:
             logger.error(f"Failed to parse Gemini response: {e}")
             return OptimizationResult(
@@ -162,8 +411,25 @@ Provide only the JSON response, no additional text.
                 estimated_improvement=0.0
             )
     
+    @staticmethod
+    def _result_from_dict(result: Dict[str, Any], original_query: str) -> OptimizationResult:
+        """Build an OptimizationResult from one parsed response object."""
+        return OptimizationResult(
+            original_query=original_query,
+            optimized_query=result.get('optimized_query', original_query),
+            optimization_type=result.get('optimization_type', 'UNKNOWN'),
+            confidence=float(result.get('confidence', 0.5)),
+            explanation=result.get('explanation', 'No explanation provided'),
+            estimated_improvement=float(result.get('estimated_improvement_pct', 0))
+        )
+
     async def suggest_indexes(self, query: str, table_schemas: Dict[str, List[str]]) -> List[str]:
         """Generate index suggestions for a query."""
+        key = self._cache_key(query, table_schemas=table_schemas)
+        cached = self._cache_get("idx:" + key)
+        if cached is not None:
+            return list(cached)
+
         prompt = f"""
 Analyze this SQL query and suggest optimal indexes for PostgreSQL:
 
@@ -172,7 +438,7 @@ Analyze this SQL query and suggest optimal indexes for PostgreSQL:
 ```
 
 Table Schemas:
-{json.dumps(table_schemas, indent=2)}
+{orjson.dumps(table_schemas, option=orjson.OPT_INDENT_2).decode()}
 
 Return a JSON array of CREATE INDEX statements that would improve this query's performance:
 
@@ -182,9 +448,11 @@ Return a JSON array of CREATE INDEX statements that would improve this query's p
         try:
             response = self.model.generate_content(prompt)
             # Extract JSON array from response
-            json_match = re.search(r'\[.*\]', response.text, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group())
+            span = _extract_json_span(response.text, opener="[")
+            if span is not None:
+                indexes = orjson.loads(span)
+                self._cache_put("idx:" + key, tuple(indexes))
+                return indexes
             return []
         except Exception as e:
             logger.error(f"Index suggestion failed: {e}")
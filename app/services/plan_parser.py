@@ -103,103 +103,137 @@ class PlanParser:
         Returns:
             Dictionary containing plan analysis results
         """
+        stats = self._collect_plan_stats(plan_node)
+
         analysis = {
             "total_cost": plan_node.total_cost,
             "actual_time": plan_node.actual_time,
-            "plan_depth": self._calculate_depth(plan_node),
-            "scan_types": self._extract_scan_types(plan_node),
-            "join_types": self._extract_join_types(plan_node),
-            "has_sequential_scan": self._has_sequential_scan(plan_node),
-            "has_index_scan": self._has_index_scan(plan_node),
             "estimated_rows": plan_node.plan_rows,
             "actual_rows": plan_node.actual_rows,
-            "tables_scanned": self._extract_tables(plan_node),
-            "indexes_used": self._extract_indexes(plan_node)
         }
-        
+        analysis.update(stats)
+
         return analysis
-    
-    def _calculate_depth(self, node: PlanNode, current_depth: int = 0) -> int:
-        """Calculate the maximum depth of the plan tree."""
-        if not node.children:
-            return current_depth
-        
-        max_depth = current_depth
-        for child in node.children:
-            child_depth = self._calculate_depth(child, current_depth + 1)
-            max_depth = max(max_depth, child_depth)
-        
-        return max_depth
-    
-    def _extract_scan_types(self, node: PlanNode) -> List[str]:
-        """Extract all scan types used in the plan."""
-        scan_types = []
-        
-        if node.scan_type:
-            scan_types.append(node.scan_type)
-        
-        for child in node.children:
-            scan_types.extend(self._extract_scan_types(child))
-        
-        return list(set(scan_types))  # Remove duplicates
-    
-    def _extract_join_types(self, node: PlanNode) -> List[str]:
-        """Extract all join types used in the plan."""
-        join_types = []
-        
-        if node.join_type:
-            join_types.append(node.join_type)
-        
-        for child in node.children:
-            join_types.extend(self._extract_join_types(child))
-        
-        return list(set(join_types))  # Remove duplicates
-    
-    def _has_sequential_scan(self, node: PlanNode) -> bool:
-        """Check if the plan contains any sequential scans."""
-        if node.scan_type and "Seq Scan" in node.scan_type:
-            return True
-        
-        for child in node.children:
-            if self._has_sequential_scan(child):
-                return True
-        
-        return False
-    
-    def _has_index_scan(self, node: PlanNode) -> bool:
-        """Check if the plan contains any index scans."""
-        if node.scan_type and "Index Scan" in node.scan_type:
-            return True
-        
-        for child in node.children:
-            if self._has_index_scan(child):
-                return True
-        
-        return False
-    
-    def _extract_tables(self, node: PlanNode) -> List[str]:
-        """Extract all table names from the plan."""
-        tables = []
-        
-        if node.table_name:
-            tables.append(node.table_name)
-        
-        for child in node.children:
-            tables.extend(self._extract_tables(child))
-        
-        return list(set(tables))  # Remove duplicates
-    
-    def _extract_indexes(self, node: PlanNode) -> List[str]:
-        """Extract all index names from the plan."""
-        indexes = []
-        
-        if node.index_name:
-            indexes.append(node.index_name)
-        
-        for child in node.children:
-            indexes.extend(self._extract_indexes(child))
-        
-        return list(set(indexes))  # Remove duplicates
+
+    def analyze_raw(self, plan_json: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Analyze EXPLAIN JSON output directly, without building a tree.
+
+        Produces the same analysis dict as parse_plan_json followed by
+        analyze_plan, but walks the raw dicts in place so no PlanNode
+        objects are allocated. Preferred when the caller only needs the
+        analysis and not the tree itself.
+
+        Args:
+            plan_json: JSON output from EXPLAIN (FORMAT JSON)
+
+        Returns:
+            Dictionary containing plan analysis results
+        """
+        try:
+            if isinstance(plan_json, list):
+                plan_json = plan_json[0]  # Take first plan if multiple
+
+            scan_types = set()
+            join_types = set()
+            tables = set()
+            indexes = set()
+            has_seq_scan = False
+            has_index_scan = False
+            max_depth = 0
+
+            stack = [(plan_json, 0)]
+            while stack:
+                node_data, depth = stack.pop()
+                if depth > max_depth:
+                    max_depth = depth
+
+                node_type = node_data.get("Node Type", "Unknown")
+                if "Scan" in node_type:
+                    scan_types.add(node_type)
+                    if "Seq Scan" in node_type:
+                        has_seq_scan = True
+                    elif "Index Scan" in node_type:
+                        has_index_scan = True
+                    table_name = node_data.get("Relation Name")
+                    if table_name:
+                        tables.add(table_name)
+                    index_name = node_data.get("Index Name")
+                    if index_name:
+                        indexes.add(index_name)
+                if "Join" in node_type:
+                    join_types.add(node_type)
+
+                for child_data in node_data.get("Plans", ()):
+                    stack.append((child_data, depth + 1))
+
+            return {
+                "total_cost": float(plan_json.get("Total Cost", 0)),
+                "actual_time": plan_json.get("Actual Time"),
+                "estimated_rows": plan_json.get("Plan Rows"),
+                "actual_rows": plan_json.get("Actual Rows"),
+                "plan_depth": max_depth,
+                "scan_types": list(scan_types),
+                "join_types": list(join_types),
+                "has_sequential_scan": has_seq_scan,
+                "has_index_scan": has_index_scan,
+                "tables_scanned": list(tables),
+                "indexes_used": list(indexes),
+            }
+
+        except Exception as e:
+            logger.error(f"Error analyzing plan JSON: {e}")
+            raise
+
+    @staticmethod
+    def _collect_plan_stats(root: PlanNode) -> Dict[str, Any]:
+        """Gather every per-node metric in one iterative traversal.
+
+        A single explicit-stack DFS replaces the previous seven recursive
+        walks (depth, scan/join types, seq/index scan flags, tables,
+        indexes), so each plan node is visited exactly once and deep
+        plans cannot hit the recursion limit.
+        """
+        scan_types = set()
+        join_types = set()
+        tables = set()
+        indexes = set()
+        has_seq_scan = False
+        has_index_scan = False
+        max_depth = 0
+
+        stack = [(root, 0)]
+        while stack:
+            node, depth = stack.pop()
+            if depth > max_depth:
+                max_depth = depth
+
+            scan_type = node.scan_type
+            if scan_type:
+                scan_types.add(scan_type)
+                if "Seq Scan" in scan_type:
+                    has_seq_scan = True
+                elif "Index Scan" in scan_type:
+                    has_index_scan = True
+            if node.join_type:
+                join_types.add(node.join_type)
+            if node.table_name:
+                tables.add(node.table_name)
+            if node.index_name:
+                indexes.add(node.index_name)
+
+            for child in node.children:
+                stack.append((child, depth + 1))
+
+        return {
+            "plan_depth": max_depth,
+            "scan_types": list(scan_types),
+            "join_types": list(join_types),
+            "has_sequential_scan": has_seq_scan,
+            "has_index_scan": has_index_scan,
+            "tables_scanned": list(tables),
+            "indexes_used": list(indexes),
+        }
 
 
 # Global instance
@@ -12,11 +12,41 @@ from app.core.logger import logger
 from app.core.config import settings
 
 
+def compute_query_hash(query_text: str) -> str:
+    """Hash a query text for identification.
+
+    blake2b is markedly faster than md5 on CPython and a 16-byte digest
+    keeps collision odds negligible at this scale; every producer of
+    query_hash must go through this helper so stored hashes stay
+    comparable.
+    """
+    return hashlib.blake2b(query_text.encode(), digest_size=16).hexdigest()
+
+
 class QueryCollector:
     """Service for collecting query statistics from pg_stat_statements."""
-    
+
     def __init__(self, db_url: str):
         self.db_url = db_url
+        self._pool: Optional[asyncpg.Pool] = None
+
+    async def _get_pool(self) -> asyncpg.Pool:
+        """Lazily create the asyncpg pool for pg_stat_statements reads.
+
+        A small pool avoids paying connection setup (TCP + auth) on every
+        collection cycle while keeping at most a handful of sockets open.
+        """
+        if self._pool is None:
+            self._pool = await asyncpg.create_pool(
+                self.db_url, min_size=1, max_size=4
+            )
+        return self._pool
+
+    async def close(self):
+        """Close the connection pool. Called on application shutdown."""
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
     
     async def collect_queries(self, session: AsyncSession) -> List[QueryLog]:
         """
@@ -26,9 +56,6 @@ class QueryCollector:
             List of newly created QueryLog instances
         """
         try:
-            # Connect to PostgreSQL to read pg_stat_statements
-            conn = await asyncpg.connect(self.db_url)
-            
             # Query pg_stat_statements for slow queries
             query = """
                 SELECT 
@@ -45,27 +72,33 @@ class QueryCollector:
                 LIMIT 100
             """
             
-            rows = await conn.fetch(query, settings.slow_query_threshold_ms)
-            await conn.close()
-            
+            pool = await self._get_pool()
+            async with pool.acquire() as conn:
+                rows = await conn.fetch(query, settings.slow_query_threshold_ms)
+
+
+            # Hash every row up front, then resolve all existing logs in
+            # one IN query instead of a round-trip per row
+            hashes = [compute_query_hash(row['query']) for row in rows]
+            existing_by_hash = {}
+            if hashes:
+                result = await session.execute(
+                    select(QueryLog).where(QueryLog.query_hash.in_(hashes))
+                )
+                existing_by_hash = {
+                    log.query_hash: log for log in result.scalars()
+                }
+
             # Process and store query logs
             query_logs = []
-            for row in rows:
-                # Create hash for query identification
-                query_hash = hashlib.md5(row['query'].encode()).hexdigest()
-                
-                # Check if query already exists
-                existing_query = await session.execute(
-                    select(QueryLog).where(QueryLog.query_hash == query_hash)
-                )
-                existing_query = existing_query.scalar_one_or_none()
-                
+            for row, query_hash in zip(rows, hashes):
+                existing_query = existing_by_hash.get(query_hash)
+
                 if existing_query:
                     # Update existing query with new statistics
                     existing_query.calls = row['calls']
                     existing_query.total_exec_time = row['total_exec_time']
                     existing_query.mean_exec_time = row['mean_exec_time']
-                    existing_query.updated_at = datetime.utcnow()
                     query_logs.append(existing_query)
                 else:
                     # Create new query log
@@ -74,13 +107,20 @@ class QueryCollector:
                         query_hash=query_hash,
                         total_exec_time=row['total_exec_time'],
                         mean_exec_time=row['mean_exec_time'],
-                        calls=row['calls'],
-                        collected_at=datetime.utcnow()
+                        calls=row['calls']
                     )
                     session.add(query_log)
+                    # Duplicate hashes later in this batch update this
+                    # row instead of inserting a second one
+                    existing_by_hash[query_hash] = query_log
                     query_logs.append(query_log)
             
             await session.commit()
+
+            # Freshly collected rows invalidate cached aggregate stats
+            from app.core.cache import stats_cache
+            stats_cache.invalidate("stats:")
+
             logger.info(f"Collected {len(query_logs)} queries from pg_stat_statements")
             return query_logs
             
@@ -89,23 +129,34 @@ class QueryCollector:
             await session.rollback()
             raise
     
-    async def get_slow_queries(self, session: AsyncSession, limit: int = 10) -> List[QueryLog]:
+    async def get_slow_queries(self, session: AsyncSession, limit: int = 10) -> List:
         """
         Get the slowest queries from the database.
-        
+
+        Selects only the columns callers need instead of hydrating full
+        QueryLog instances, so no ORM bookkeeping happens per row.
+
         Args:
             session: Database session
             limit: Maximum number of queries to return
-            
+
         Returns:
-            List of slowest QueryLog instances
+            List of rows with query identification and timing columns
         """
         result = await session.execute(
-            select(QueryLog)
+            select(
+                QueryLog.id,
+                QueryLog.query_text,
+                QueryLog.query_hash,
+                QueryLog.mean_exec_time,
+                QueryLog.calls,
+                QueryLog.total_exec_time,
+                QueryLog.collected_at,
+            )
             .order_by(QueryLog.mean_exec_time.desc())
             .limit(limit)
         )
-        return result.scalars().all()
+        return result.all()
     
     async def get_query_by_hash(self, session: AsyncSession, query_hash: str) -> Optional[QueryLog]:
         """
@@ -141,4 +192,4 @@ class QueryCollector:
 
 
 # Global instance
-query_collector = QueryCollector(settings.database_url) 
\ No newline at end of file
+query_collector = QueryCollector(settings.database_dsn) 
\ No newline at end of file
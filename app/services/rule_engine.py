@@ -1,4 +1,6 @@
 from typing import List, Dict, Any, Optional
+
+from sqlalchemy import Text, cast, inspect, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.suggestion import Suggestion
@@ -32,11 +34,24 @@ class RuleEngine:
             List of Suggestion instances
         """
         suggestions = []
-        
+
+        # plan_json is a deferred column; for persistent rows where it
+        # was not loaded, run the seq-scan check server-side instead of
+        # pulling the whole EXPLAIN blob over the wire
+        has_seq_scan = False
+        if execution_plan is not None:
+            if inspect(execution_plan).persistent and "plan_json" in inspect(execution_plan).unloaded:
+                has_seq_scan = bool(await session.scalar(
+                    select(cast(ExecutionPlan.plan_json, Text).contains("Seq Scan"))
+                    .where(ExecutionPlan.id == execution_plan.id)
+                ))
+            else:
+                has_seq_scan = bool(execution_plan.plan_json) and "Seq Scan" in str(execution_plan.plan_json)
+
         # Apply various rule sets
         suggestions.extend(await self._apply_query_structure_rules(query_log, query_feature))
         suggestions.extend(await self._apply_performance_rules(query_log, query_feature))
-        suggestions.extend(await self._apply_plan_based_rules(query_log, execution_plan))
+        suggestions.extend(await self._apply_plan_based_rules(query_log, execution_plan, has_seq_scan))
         suggestions.extend(await self._apply_index_rules(query_log, query_feature, execution_plan))
         
         # Limit suggestions to configured maximum
@@ -154,18 +169,20 @@ class RuleEngine:
         return suggestions
     
     async def _apply_plan_based_rules(
-        self, 
-        query_log: QueryLog, 
-        execution_plan: Optional[ExecutionPlan]
+        self,
+        query_log: QueryLog,
+        execution_plan: Optional[ExecutionPlan],
+        has_seq_scan: bool = False
     ) -> List[Suggestion]:
         """Apply rules based on execution plan analysis."""
         suggestions = []
-        
+
         if not execution_plan:
             return suggestions
-        
-        # Rule: Sequential scans
-        if execution_plan.plan_json and "Seq Scan" in str(execution_plan.plan_json):
+
+        # Rule: Sequential scans (flag computed by the caller so the
+        # deferred plan blob is never loaded here)
+        if has_seq_scan:
             suggestions.append(Suggestion(
                 suggestion_type="INDEX",
                 message="Query uses sequential scan. Consider adding indexes on frequently queried columns",
@@ -246,14 +263,16 @@ class RuleEngine:
             query_id: Query ID
             
         Returns:
-            List of Suggestion instances
+            List of Suggestion instances, highest confidence first
         """
         from sqlalchemy import select
-        
-        result = await session.execute(
-            select(Suggestion).where(Suggestion.query_id == query_id)
+
+        result = await session.scalars(
+            select(Suggestion)
+            .where(Suggestion.query_id == query_id)
+            .order_by(Suggestion.confidence.desc())
         )
-        return result.scalars().all()
+        return result.all()
 
 
 # Global instance
@@ -0,0 +1,98 @@
+"""Durable benchmark jobs for the arq worker.
+
+Run the worker with:
+
+    arq app.workers.benchmark_worker.WorkerSettings
+
+Jobs carry query IDs rather than ORM instances: ORM objects are bound to
+the session that loaded them and do not survive queueing or process
+restarts, so each job reloads its QueryLog fresh.
+"""
+from typing import Any, Dict, List
+from uuid import UUID
+
+from sqlalchemy import select
+
+from app.db.session import AsyncSessionLocal
+from app.models.query_log import QueryLog
+from app.services.benchmark_engine import benchmark_engine
+from app.services.rule_engine import rule_engine
+from app.core.config import settings
+from app.core.logger import logger
+
+try:
+    from arq.connections import RedisSettings
+except ImportError:  # pragma: no cover - arq is optional
+    RedisSettings = None
+
+
+async def run_benchmark_by_id(query_id: str, iterations: int = 5) -> bool:
+    """
+    Reload a query by ID and run a comprehensive benchmark on it.
+
+    Also used directly as the in-process BackgroundTasks fallback when
+    no job queue is configured.
+
+    Args:
+        query_id: QueryLog ID as a string
+        iterations: Number of benchmark iterations
+
+    Returns:
+        True if the benchmark ran and succeeded
+    """
+    try:
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(QueryLog).where(QueryLog.id == UUID(query_id))
+            )
+            query_log = result.scalar_one_or_none()
+
+            if not query_log:
+                logger.warning(f"Benchmark job skipped: query {query_id} not found")
+                return False
+
+            suggestions = await rule_engine.get_suggestions_for_query(session, query_id)
+            if not suggestions:
+                suggestions = await rule_engine.generate_suggestions(session, query_log)
+
+            benchmark_result = await benchmark_engine.run_comprehensive_benchmark(
+                session, query_log, suggestions, iterations
+            )
+
+            logger.info(f"Benchmark job completed for query {query_id}: "
+                       f"{benchmark_result.improvement_pct:.1f}% improvement")
+            return benchmark_result.success
+
+    except Exception as e:
+        logger.error(f"Benchmark job failed for query {query_id}: {e}")
+        return False
+
+
+async def worker_startup(ctx: Dict[str, Any]) -> None:
+    """Ensure the benchmark results table exists before jobs run."""
+    async with AsyncSessionLocal() as session:
+        await benchmark_engine.init(session)
+
+
+async def benchmark_query_job(ctx: Dict[str, Any], query_id: str, iterations: int = 5) -> bool:
+    """arq entry point for a single-query benchmark."""
+    return await run_benchmark_by_id(query_id, iterations)
+
+
+async def batch_benchmark_job(ctx: Dict[str, Any], queries_data: List[Dict[str, Any]]) -> None:
+    """arq entry point for a batch benchmark."""
+    from app.api.routes.benchmark import run_batch_benchmark_task
+    await run_batch_benchmark_task(queries_data)
+
+
+class WorkerSettings:
+    """arq worker configuration.
+
+    max_jobs bounds worker concurrency to stay inside the Postgres
+    connection pool shared with the API.
+    """
+    functions = [benchmark_query_job, batch_benchmark_job]
+    on_startup = worker_startup
+    max_jobs = 4
+    if RedisSettings is not None and settings.redis_url:
+        redis_settings = RedisSettings.from_dsn(settings.redis_url)